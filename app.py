@@ -6,29 +6,43 @@ Options Scalping Bot - Main Application (Simple Version)
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
+import plotly.io as pio
 import numpy as np
 from datetime import datetime, timedelta
 import time
-import threading
-import asyncio
+from collections import deque
 from typing import Dict, List, Optional, Tuple
-import json
 import os
 from dotenv import load_dotenv
 
 # Import optimized modules
 from modules.data_fetcher import data_fetcher, get_minute_data, get_real_time_price
 from modules.indicators import indicators_calculator, calc_indicators
-from modules.signal_engine import signal_engine, check_signals, should_buy, should_sell
+from modules.signal_engine import signal_engine, check_signals, should_sell, signal_mask, SIGNAL_COUNT
 from modules.trade_executor import execute_trade, check_total_loss, get_open_trades, trade_active
 from modules.risk_manager import check_exit_conditions
-from modules.logger import log_trade, get_trade_history
-from modules.schwab_auth import SchwabAuth
+from modules.logger import log_trade, get_trade_history, get_trade_log_signature, TRADE_BUFFER_SIZE
 
-# Load environment variables
-load_dotenv(".env")
+# Serialize figures with orjson rather than the stdlib json encoder
+pio.json.config.default_engine = "orjson"
+
+# Load environment variables once per process rather than re-reading .env on every rerun
+@st.cache_resource(show_spinner=False)
+def _load_env() -> bool:
+    return load_dotenv(".env")
+
+_load_env()
+
+# The script re-executes on every rerun, so the pooled token session lives in the resource cache
+@st.cache_resource(show_spinner=False)
+def _token_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    session.headers.update({'Accept': 'application/json'})
+    return session
 
 # Page configuration
 st.set_page_config(
@@ -38,7 +52,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
+# Custom CSS for better styling. This has to be emitted on every full rerun:
+# Streamlit drops elements a run does not re-send, so it cannot be guarded
+# by a session_state flag. Fragment reruns skip it.
 st.markdown("""
 <style>
     .main-header {
@@ -69,6 +85,129 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def _minute_bucket() -> int:
+    """Current wall-clock minute, used to key the per-tick caches"""
+    return int(time.time() // 60)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_minute_data(ticker: str, minute_bucket: int) -> pd.DataFrame:
+    """Minute bars for ticker, fetched at most once per minute"""
+    return get_minute_data(ticker)
+
+def _last_bar_key(df: pd.DataFrame) -> int:
+    """Identify a bar set by its newest timestamp (ns), used to key indicator caches"""
+    last = df.index[-1]
+    return last.value if isinstance(last, pd.Timestamp) else len(df)
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def _cached_indicators(ticker: str, last_bar: int, _df: pd.DataFrame) -> Dict:
+    """Indicators for ticker, recomputed only when a new bar arrives"""
+    return calc_indicators(_df)
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def _cached_signals(ticker: str, last_bar: int, _indicators: Dict) -> Dict[str, bool]:
+    """Signal flags for the indicators of ticker's latest bar"""
+    return check_signals(_indicators)
+
+def _load_ticker_analysis(ticker: str) -> Tuple[pd.DataFrame, Dict, Dict[str, bool]]:
+    """Cached minute bars, indicators and signals for ticker (empty dicts if no data)"""
+    # Within a minute the cached results cannot change; reuse this session's copy
+    # instead of paying st.cache_data's hashing and unpickling on every 2s tick
+    memo_key = (ticker, _minute_bucket())
+    memo = st.session_state.get('_ticker_analysis')
+    if memo is not None and memo[0] == memo_key:
+        return memo[1]
+    
+    df = _cached_minute_data(*memo_key)
+    if df.empty:
+        result = (df, {}, {})
+    else:
+        last_bar = _last_bar_key(df)
+        indicators = _cached_indicators(ticker, last_bar, df)
+        signals = _cached_signals(ticker, last_bar, indicators)
+        result = (df, indicators, signals)
+    
+    st.session_state._ticker_analysis = (memo_key, result)
+    return result
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_open_trades() -> List[Dict]:
+    """Open trades, refreshed at most every few seconds"""
+    return get_open_trades()
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_daily_pnl() -> float:
+    """Daily P&L, refreshed at most every few seconds"""
+    return check_total_loss()
+
+def _trades_key(trades: List[Dict]) -> Tuple:
+    """Cheap fingerprint of a trade list: window bounds plus the signature of the log it came from"""
+    return (len(trades), trades[0].get('timestamp'), trades[-1].get('timestamp'), get_trade_log_signature())
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _trade_columns(trades_key: Tuple, _trades: List[Dict]) -> Dict[str, np.ndarray]:
+    """Column arrays for the trade list: timestamp (datetime64) and pnl (float64, NaN if missing)"""
+    return {
+        'timestamp': pd.to_datetime([t.get('timestamp') for t in _trades], format='ISO8601', cache=True).to_numpy(),
+        'pnl': np.fromiter(
+            (np.nan if t.get('pnl') is None else t['pnl'] for t in _trades),
+            dtype=np.float64, count=len(_trades)
+        ),
+    }
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _trades_frame(trades_key: Tuple, _trades: List[Dict]) -> pd.DataFrame:
+    """Typed trade table, rebuilt only when the trade log changes"""
+    df_trades = pd.DataFrame(_trades)
+    # Keep native datetime/float columns; st.dataframe formats them client-side
+    for name, values in _trade_columns(trades_key, _trades).items():
+        if name in df_trades.columns:
+            df_trades[name] = values
+    return df_trades
+
+# (label, indicator key, format) rows for the technical analysis panels
+_PRICE_INDICATOR_METRICS = (
+    ("RSI", 'rsi', "{:.1f}"),
+    ("MACD", 'macd', "{:.4f}"),
+    ("Volume Ratio", 'volume_ratio', "{:.2f}"),
+    ("ATR", 'atr', "{:.4f}"),
+)
+_TREND_INDICATOR_METRICS = (
+    ("SMA 20", 'sma_20', "${:.2f}"),
+    ("SMA 50", 'sma_50', "${:.2f}"),
+    ("VWAP", 'vwap', "${:.2f}"),
+    ("BB Width", 'bb_width', "{:.4f}"),
+)
+_ADVANCED_INDICATOR_METRICS = (
+    (("Williams %R", 'williams_r', "{:.1f}"), ("CCI", 'cci', "{:.1f}")),
+    (("MFI", 'mfi', "{:.1f}"), ("ADX", 'adx', "{:.1f}")),
+    (("Stoch RSI K", 'stoch_rsi_k', "{:.1f}"), ("Stoch RSI D", 'stoch_rsi_d', "{:.1f}")),
+)
+
+def _render_indicator_metrics(indicators: Dict, metrics: Tuple) -> None:
+    """Render one st.metric per (label, key, format) row"""
+    get = indicators.get
+    for label, key, fmt in metrics:
+        st.metric(label, fmt.format(get(key, 0)))
+
+def _hline_shape(y: float, row: int, color: str, dash: str = "solid", label: str = "") -> Dict:
+    """Horizontal line shape spanning subplot row of the live chart"""
+    suffix = "" if row == 1 else str(row)
+    shape = {
+        'type': 'line', 'xref': f'x{suffix} domain', 'yref': f'y{suffix}',
+        'x0': 0, 'x1': 1, 'y0': y, 'y1': y,
+        'line': {'color': color, 'dash': dash},
+    }
+    if label:
+        shape['label'] = {'text': label, 'textposition': 'end'}
+    return shape
+
+# Fixed RSI overbought/oversold levels, built once
+_RSI_LEVEL_SHAPES = (
+    _hline_shape(70, 3, "red", dash="dash"),
+    _hline_shape(30, 3, "green", dash="dash"),
+)
+
 class OptimizedScalpingBot:
     """Optimized options scalping bot with enhanced features"""
     
@@ -90,7 +229,7 @@ class OptimizedScalpingBot:
         if 'bot_running' not in self.session_state:
             self.session_state.bot_running = False
         if 'trade_history' not in self.session_state:
-            self.session_state.trade_history = []
+            self.session_state.trade_history = deque(maxlen=TRADE_BUFFER_SIZE)
         if 'performance_data' not in self.session_state:
             self.session_state.performance_data = []
     
@@ -118,26 +257,34 @@ class OptimizedScalpingBot:
         """Setup sidebar configuration"""
         st.sidebar.header("⚙️ Bot Configuration")
         
-        # Trading parameters
-        st.sidebar.subheader("📊 Trading Parameters")
-        TICKER = st.sidebar.text_input("Stock Ticker", value="META", help="Enter the stock ticker to trade")
-        TRADE_SIZE = st.sidebar.slider("Max Price Per Trade ($)", min_value=100, max_value=2000, value=500, step=50)
-        DAILY_LIMIT = st.sidebar.slider("Max Daily Loss ($)", min_value=100, max_value=2000, value=500, step=50)
-        PROFIT_TARGET = st.sidebar.slider("Profit % Target", min_value=1, max_value=15, value=3, step=1)
-        STOP_LOSS = st.sidebar.slider("Stop Loss %", min_value=1, max_value=10, value=3, step=1)
-        
-        # Advanced parameters
-        st.sidebar.subheader("🔧 Advanced Settings")
-        MIN_SIGNAL_STRENGTH = st.sidebar.slider("Min Signal Strength", min_value=40, max_value=90, value=60, step=5)
-        MAX_TRADE_DURATION = st.sidebar.slider("Max Trade Duration (min)", min_value=1, max_value=10, value=3, step=1)
-        ENABLE_TRAILING_STOP = st.sidebar.checkbox("Enable Trailing Stop", value=True)
-        TRAILING_STOP_PCT = st.sidebar.slider("Trailing Stop %", min_value=1, max_value=5, value=2, step=1) if ENABLE_TRAILING_STOP else 2
-        
-        # Risk management
-        st.sidebar.subheader("🛡️ Risk Management")
-        MAX_CONCURRENT_TRADES = st.sidebar.slider("Max Concurrent Trades", min_value=1, max_value=5, value=1, step=1)
-        ENABLE_CORRELATION_CHECK = st.sidebar.checkbox("Enable Correlation Check", value=True)
-        MIN_VOLUME_RATIO = st.sidebar.slider("Min Volume Ratio", min_value=1.0, max_value=3.0, value=1.5, step=0.1)
+        # Parameters are batched in a form so adjusting several sliders costs
+        # one rerun on Apply instead of a full rerun per slider move
+        with st.sidebar.form("bot_config"):
+            # Trading parameters
+            st.subheader("📊 Trading Parameters")
+            TICKER = st.text_input("Stock Ticker", value="META", help="Enter the stock ticker to trade")
+            TRADE_SIZE = st.slider("Max Price Per Trade ($)", min_value=100, max_value=2000, value=500, step=50)
+            DAILY_LIMIT = st.slider("Max Daily Loss ($)", min_value=100, max_value=2000, value=500, step=50)
+            PROFIT_TARGET = st.slider("Profit % Target", min_value=1, max_value=15, value=3, step=1)
+            STOP_LOSS = st.slider("Stop Loss %", min_value=1, max_value=10, value=3, step=1)
+            
+            # Advanced parameters
+            st.subheader("🔧 Advanced Settings")
+            MIN_SIGNAL_STRENGTH = st.slider("Min Signal Strength", min_value=40, max_value=90, value=60, step=5)
+            MAX_TRADE_DURATION = st.slider("Max Trade Duration (min)", min_value=1, max_value=10, value=3, step=1)
+            ENABLE_TRAILING_STOP = st.checkbox("Enable Trailing Stop", value=True)
+            TRAILING_STOP_PCT = st.slider("Trailing Stop %", min_value=1, max_value=5, value=2, step=1,
+                                          help="Used when trailing stop is enabled")
+            if not ENABLE_TRAILING_STOP:
+                TRAILING_STOP_PCT = 2
+            
+            # Risk management
+            st.subheader("🛡️ Risk Management")
+            MAX_CONCURRENT_TRADES = st.slider("Max Concurrent Trades", min_value=1, max_value=5, value=1, step=1)
+            ENABLE_CORRELATION_CHECK = st.checkbox("Enable Correlation Check", value=True)
+            MIN_VOLUME_RATIO = st.slider("Min Volume Ratio", min_value=1.0, max_value=3.0, value=1.5, step=0.1)
+            
+            st.form_submit_button("✅ Apply Settings")
         
         # Performance monitoring
         st.sidebar.subheader("📈 Performance")
@@ -195,23 +342,18 @@ class OptimizedScalpingBot:
         with col4:
             self.show_daily_pnl()
         
-        # Main trading area
-        tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔐 OAuth Setup", "📈 Live Trading", "📊 Technical Analysis", "📋 Trade History", "🎯 Performance"])
-        
-        with tab1:
-            self.show_oauth_setup()
-        
-        with tab2:
-            self.show_live_trading()
-        
-        with tab3:
-            self.show_technical_analysis()
-        
-        with tab4:
-            self.show_trade_history()
-        
-        with tab5:
-            self.show_performance_analysis()
+        # Main trading area. st.tabs would execute every tab body on each rerun,
+        # so render only the selected view
+        views = {
+            "🔐 OAuth Setup": self.show_oauth_setup,
+            "📈 Live Trading": self.show_live_trading,
+            "📊 Technical Analysis": self.show_technical_analysis,
+            "📋 Trade History": self.show_trade_history,
+            "🎯 Performance": self.show_performance_analysis,
+        }
+        active_tab = st.radio("View", list(views), index=1, horizontal=True,
+                              key="active_tab", label_visibility="collapsed")
+        views[active_tab]()
     
     def show_dashboard(self):
         """Show the main dashboard when bot is not running"""
@@ -234,6 +376,7 @@ class OptimizedScalpingBot:
         if st.button("🔍 Quick Market Analysis"):
             self.perform_quick_analysis()
     
+    @st.fragment(run_every="2s")
     def show_market_status(self):
         """Display market status"""
         market_status = data_fetcher.get_market_status()
@@ -252,12 +395,13 @@ class OptimizedScalpingBot:
     
     def show_current_trades(self):
         """Display current trades"""
-        open_trades = get_open_trades()
+        open_trades = _cached_open_trades()
         st.metric("Open Trades", len(open_trades), delta="Active positions")
     
+    @st.fragment(run_every="2s")
     def show_daily_pnl(self):
         """Display daily P&L"""
-        daily_pnl = check_total_loss()
+        daily_pnl = _cached_daily_pnl()
         color = "normal"
         if daily_pnl > 0:
             color = "inverse"
@@ -266,6 +410,7 @@ class OptimizedScalpingBot:
         
         st.metric("Daily P&L", f"${daily_pnl:.2f}", delta_color=color)
     
+    @st.fragment(run_every="10s")
     def show_data_fetcher_metrics(self):
         """Display data fetcher performance metrics"""
         metrics = data_fetcher.get_performance_metrics()
@@ -276,6 +421,7 @@ class OptimizedScalpingBot:
         st.metric("Total Requests", metrics['requests_made'])
         st.markdown('</div>', unsafe_allow_html=True)
     
+    @st.fragment(run_every="10s")
     def show_signal_engine_metrics(self):
         """Display signal engine performance metrics"""
         metrics = signal_engine.performance_metrics
@@ -286,21 +432,18 @@ class OptimizedScalpingBot:
         st.metric("False Positives", metrics['false_positives'])
         st.markdown('</div>', unsafe_allow_html=True)
     
+    @st.fragment(run_every="2s")
     def show_live_trading(self):
         """Show live trading interface"""
         # Real-time data
         ticker = self.config['TICKER']
         
-        # Get current data
-        df = get_minute_data(ticker)
+        # Get current data, indicators and signals
+        df, indicators, signals = _load_ticker_analysis(ticker)
         if df.empty:
             st.error(f"❌ No data available for {ticker}")
             return
         
-        # Calculate indicators
-        indicators = calc_indicators(df)
-        signals = check_signals(indicators)
-        
         # Display current price and signals
         col1, col2, col3 = st.columns(3)
         
@@ -309,34 +452,39 @@ class OptimizedScalpingBot:
             st.metric("Current Price", f"${current_price:.2f}")
         
         with col2:
-            signal_strength = signal_engine.get_signal_strength(indicators)
+            signal_strength = signal_engine.get_signal_strength(indicators, signals)
             st.metric("Signal Strength", f"{signal_strength}/100")
         
         with col3:
-            positive_signals = sum(signals.values())
-            st.metric("Positive Signals", f"{positive_signals}/{len(signals)}")
+            positive_signals = signal_mask(signals).bit_count()
+            st.metric("Positive Signals", f"{positive_signals}/{SIGNAL_COUNT}")
         
         # Signal breakdown
         st.subheader("📊 Signal Analysis")
-        signal_cols = st.columns(len(signals))
+        # Signal names are fixed for the session: build the labels once
+        signal_names = tuple(signals)
+        if self.session_state.get('signal_labels', (None,))[0] != signal_names:
+            self.session_state.signal_labels = (signal_names, [name.replace('_', ' ').title() for name in signal_names])
+        signal_labels = self.session_state.signal_labels[1]
         
-        for i, (signal_name, signal_value) in enumerate(signals.items()):
-            with signal_cols[i]:
-                color = "🟢" if signal_value else "🔴"
-                st.metric(signal_name.replace('_', ' ').title(), color, delta="Active" if signal_value else "Inactive")
+        for col, label, signal_value in zip(st.columns(len(signals)), signal_labels, signals.values()):
+            col.metric(label, "🟢" if signal_value else "🔴", delta="Active" if signal_value else "Inactive")
         
         # Trading decision
         st.subheader("🎯 Trading Decision")
         
-        should_buy_signal = should_buy(indicators, self.config['MIN_SIGNAL_STRENGTH'])
-        buy_confidence = signal_engine.get_signal_confidence(indicators)
+        # Reuse the signals and strength computed above rather than re-deriving them
+        should_buy_signal = signal_engine.should_buy(indicators, self.config['MIN_SIGNAL_STRENGTH'], signals)
+        buy_confidence = signal_engine.get_signal_confidence(indicators, signals, signal_strength)
         
-        if should_buy_signal and not trade_active():
+        is_trade_active = trade_active()
+        
+        if should_buy_signal and not is_trade_active:
             st.success(f"✅ BUY SIGNAL - Confidence: {buy_confidence:.1%}")
             
             if st.button("🚀 Execute Trade"):
                 self.execute_trade(ticker, indicators)
-        elif trade_active():
+        elif is_trade_active:
             st.warning("⚠️ Trade already active")
         else:
             st.info("⏳ Waiting for buy signal...")
@@ -347,46 +495,28 @@ class OptimizedScalpingBot:
     def show_technical_analysis(self):
         """Show technical analysis"""
         ticker = self.config['TICKER']
-        df = get_minute_data(ticker)
+        df, indicators, _ = _load_ticker_analysis(ticker)
         
         if df.empty:
             st.error(f"❌ No data available for {ticker}")
             return
         
-        indicators = calc_indicators(df)
-        
         # Technical indicators display
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("📈 Price Indicators")
-            st.metric("RSI", f"{indicators.get('rsi', 0):.1f}")
-            st.metric("MACD", f"{indicators.get('macd', 0):.4f}")
-            st.metric("Volume Ratio", f"{indicators.get('volume_ratio', 0):.2f}")
-            st.metric("ATR", f"{indicators.get('atr', 0):.4f}")
+            _render_indicator_metrics(indicators, _PRICE_INDICATOR_METRICS)
         
         with col2:
             st.subheader("📊 Trend Indicators")
-            st.metric("SMA 20", f"${indicators.get('sma_20', 0):.2f}")
-            st.metric("SMA 50", f"${indicators.get('sma_50', 0):.2f}")
-            st.metric("VWAP", f"${indicators.get('vwap', 0):.2f}")
-            st.metric("BB Width", f"{indicators.get('bb_width', 0):.4f}")
+            _render_indicator_metrics(indicators, _TREND_INDICATOR_METRICS)
         
         # Advanced indicators
         st.subheader("🔬 Advanced Indicators")
-        adv_col1, adv_col2, adv_col3 = st.columns(3)
-        
-        with adv_col1:
-            st.metric("Williams %R", f"{indicators.get('williams_r', 0):.1f}")
-            st.metric("CCI", f"{indicators.get('cci', 0):.1f}")
-        
-        with adv_col2:
-            st.metric("MFI", f"{indicators.get('mfi', 0):.1f}")
-            st.metric("ADX", f"{indicators.get('adx', 0):.1f}")
-        
-        with adv_col3:
-            st.metric("Stoch RSI K", f"{indicators.get('stoch_rsi_k', 0):.1f}")
-            st.metric("Stoch RSI D", f"{indicators.get('stoch_rsi_d', 0):.1f}")
+        for col, metrics in zip(st.columns(3), _ADVANCED_INDICATOR_METRICS):
+            with col:
+                _render_indicator_metrics(indicators, metrics)
         
         # Pattern detection
         st.subheader("🎯 Pattern Detection")
@@ -413,8 +543,9 @@ class OptimizedScalpingBot:
             st.info("📋 No trades recorded yet")
             return
         
-        # Convert to DataFrame for better display
-        df_trades = pd.DataFrame(trades)
+        trades_key = _trades_key(trades)
+        df_trades = _trades_frame(trades_key, trades)
+        pnl = _trade_columns(trades_key, trades)['pnl']
         
         # Display trade summary
         col1, col2, col3, col4 = st.columns(4)
@@ -423,11 +554,11 @@ class OptimizedScalpingBot:
             st.metric("Total Trades", len(trades))
         
         with col2:
-            winning_trades = len([t for t in trades if t.get('pnl', 0) and t.get('pnl', 0) > 0])
+            winning_trades = int(np.count_nonzero(pnl > 0))
             st.metric("Winning Trades", winning_trades)
         
         with col3:
-            total_pnl = sum([t.get('pnl', 0) or 0 for t in trades])
+            total_pnl = np.nansum(pnl)
             st.metric("Total P&L", f"${total_pnl:.2f}")
         
         with col4:
@@ -437,14 +568,17 @@ class OptimizedScalpingBot:
         # Trade table
         st.subheader("📋 Recent Trades")
         if not df_trades.empty:
-            # Format the DataFrame for display
-            display_df = df_trades.copy()
-            if 'timestamp' in display_df.columns:
-                display_df['timestamp'] = pd.to_datetime(display_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-            if 'pnl' in display_df.columns:
-                display_df['pnl'] = display_df['pnl'].apply(lambda x: f"${x:.2f}" if pd.notna(x) and x is not None else "N/A")
-            
-            st.dataframe(display_df, use_container_width=True)
+            st.dataframe(
+                df_trades,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'timestamp': st.column_config.DatetimeColumn("Timestamp", format="YYYY-MM-DD HH:mm:ss"),
+                    'price': st.column_config.NumberColumn("Price", format="$%.2f"),
+                    'trade_size': st.column_config.NumberColumn("Trade Size", format="$%.2f"),
+                    'pnl': st.column_config.NumberColumn("P&L", format="$%.2f"),
+                }
+            )
     
     def show_performance_analysis(self):
         """Show performance analysis"""
@@ -458,7 +592,7 @@ class OptimizedScalpingBot:
         self.calculate_performance_metrics(trades)
         
         # Performance overview
-        col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
             st.metric("Total P&L", f"${self.performance_metrics['total_pnl']:.2f}")
@@ -472,6 +606,9 @@ class OptimizedScalpingBot:
         with col4:
             st.metric("Avg Loss", f"${self.performance_metrics['avg_loss']:.2f}")
         
+        with col5:
+            st.metric("Max Drawdown", f"${self.performance_metrics['max_drawdown']:.2f}")
+        
         # Performance charts
         self.plot_performance_charts(trades)
     
@@ -480,39 +617,46 @@ class OptimizedScalpingBot:
         if not trades:
             return
         
-        # Filter trades with valid P&L data
-        trades_with_pnl = [t for t in trades if t.get('pnl') is not None]
-        winning_trades = [t for t in trades_with_pnl if t.get('pnl', 0) > 0]
-        losing_trades = [t for t in trades_with_pnl if t.get('pnl', 0) < 0]
+        # NaN marks trades without P&L data
+        pnl = _trade_columns(_trades_key(trades), trades)['pnl']
+        valid = pnl[~np.isnan(pnl)]
+        wins = valid[valid > 0]
+        losses = valid[valid < 0]
         
         self.performance_metrics['total_trades'] = len(trades)
-        self.performance_metrics['winning_trades'] = len(winning_trades)
-        self.performance_metrics['losing_trades'] = len(losing_trades)
-        self.performance_metrics['total_pnl'] = sum([t.get('pnl', 0) or 0 for t in trades])
-        self.performance_metrics['win_rate'] = len(winning_trades) / len(trades_with_pnl) * 100 if trades_with_pnl else 0
-        self.performance_metrics['avg_win'] = sum([t.get('pnl', 0) for t in winning_trades]) / len(winning_trades) if winning_trades else 0
-        self.performance_metrics['avg_loss'] = sum([t.get('pnl', 0) for t in losing_trades]) / len(losing_trades) if losing_trades else 0
+        self.performance_metrics['winning_trades'] = len(wins)
+        self.performance_metrics['losing_trades'] = len(losses)
+        self.performance_metrics['total_pnl'] = float(valid.sum())
+        self.performance_metrics['win_rate'] = len(wins) / len(valid) * 100 if len(valid) else 0
+        self.performance_metrics['avg_win'] = float(wins.mean()) if len(wins) else 0
+        self.performance_metrics['avg_loss'] = float(losses.mean()) if len(losses) else 0
+        
+        # Max drawdown of the cumulative P&L curve (log order is chronological)
+        equity = np.cumsum(valid)
+        peak = np.maximum.accumulate(np.maximum(equity, 0))
+        self.performance_metrics['max_drawdown'] = float((peak - equity).max()) if len(equity) else 0.0
     
     def plot_performance_charts(self, trades):
         """Plot performance charts"""
         if not trades:
             return
         
-        df_trades = pd.DataFrame(trades)
-        df_trades['timestamp'] = pd.to_datetime(df_trades['timestamp'])
-        df_trades = df_trades.sort_values('timestamp')
+        columns = _trade_columns(_trades_key(trades), trades)
+        timestamps, pnl = columns['timestamp'], columns['pnl']
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, pnl = timestamps[order], pnl[order]
         
         # Cumulative P&L chart
         fig1 = go.Figure()
-        df_trades['cumulative_pnl'] = df_trades['pnl'].cumsum()
-        fig1.add_trace(go.Scatter(x=df_trades['timestamp'], y=df_trades['cumulative_pnl'], 
+        fig1.add_trace(go.Scatter(x=timestamps, y=np.cumsum(np.nan_to_num(pnl)), 
                                  mode='lines+markers', name='Cumulative P&L'))
         fig1.update_layout(title="Cumulative P&L Over Time", xaxis_title="Time", yaxis_title="P&L ($)")
         st.plotly_chart(fig1, use_container_width=True)
         
-        # P&L distribution
+        # P&L distribution, binned server-side so only 20 bars are sent to the browser
         fig2 = go.Figure()
-        fig2.add_trace(go.Histogram(x=df_trades['pnl'], nbinsx=20, name='P&L Distribution'))
+        counts, edges = np.histogram(pnl[~np.isnan(pnl)], bins=20)
+        fig2.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), name='P&L Distribution'))
         fig2.update_layout(title="P&L Distribution", xaxis_title="P&L ($)", yaxis_title="Frequency")
         st.plotly_chart(fig2, use_container_width=True)
     
@@ -530,25 +674,26 @@ class OptimizedScalpingBot:
             row_heights=[0.6, 0.2, 0.2]
         )
         
-        # Price chart with Bollinger Bands
-        fig.add_trace(go.Scatter(x=df.index, y=df['Close'], mode='lines', name='Price', line=dict(color='blue')), row=1, col=1)
+        # Hand plotly plain arrays rather than Series it would convert via tolist()
+        x = df.index.to_numpy()
         
-        if 'bb_upper' in indicators and 'bb_lower' in indicators:
-            fig.add_trace(go.Scatter(x=df.index, y=[indicators['bb_upper']] * len(df), 
-                                   mode='lines', name='BB Upper', line=dict(color='red', dash='dash')), row=1, col=1)
-            fig.add_trace(go.Scatter(x=df.index, y=[indicators['bb_lower']] * len(df), 
-                                   mode='lines', name='BB Lower', line=dict(color='red', dash='dash')), row=1, col=1)
+        # Price chart with Bollinger Bands
+        fig.add_trace(go.Scattergl(x=x, y=df['Close'].to_numpy(), mode='lines', name='Price', line=dict(color='blue')), row=1, col=1)
         
         # Volume chart
-        fig.add_trace(go.Bar(x=df.index, y=df['Volume'], name='Volume', marker_color='lightblue'), row=2, col=1)
+        fig.add_trace(go.Bar(x=x, y=df['Volume'].to_numpy(), name='Volume', marker_color='lightblue'), row=2, col=1)
         
-        # RSI chart
-        rsi_values = [indicators.get('rsi', 50)] * len(df)
-        fig.add_trace(go.Scatter(x=df.index, y=rsi_values, mode='lines', name='RSI', line=dict(color='purple')), row=3, col=1)
-        fig.add_hline(y=70, line_dash="dash", line_color="red", row=3, col=1)
-        fig.add_hline(y=30, line_dash="dash", line_color="green", row=3, col=1)
+        # Bands and RSI are single current values: draw them as horizontal line
+        # shapes in one layout update rather than N-length traces or per-line add_hline
+        shapes = list(_RSI_LEVEL_SHAPES)
+        if 'bb_upper' in indicators and 'bb_lower' in indicators:
+            shapes.append(_hline_shape(indicators['bb_upper'], 1, "red", dash="dash", label="BB Upper"))
+            shapes.append(_hline_shape(indicators['bb_lower'], 1, "red", dash="dash", label="BB Lower"))
+        shapes.append(_hline_shape(indicators.get('rsi', 50), 3, "purple", label="RSI"))
+        fig.update_yaxes(range=[0, 100], row=3, col=1)
         
-        fig.update_layout(height=600, showlegend=True)
+        # uirevision keeps the user's pan/zoom across the 2s auto-refresh reruns
+        fig.update_layout(shapes=shapes, height=600, showlegend=True, uirevision=self.config['TICKER'])
         st.plotly_chart(fig, use_container_width=True)
     
     def execute_trade(self, ticker, indicators):
@@ -558,6 +703,10 @@ class OptimizedScalpingBot:
             success = execute_trade(contract, self.config['TRADE_SIZE'])
             
             if success:
+                # Open trades and P&L changed; don't serve the cached values
+                _cached_open_trades.clear()
+                _cached_daily_pnl.clear()
+                
                 current_price = indicators.get('current_price', 0)
                 log_trade(ticker, contract, "BUY", current_price, self.config['TRADE_SIZE'])
                 
@@ -583,16 +732,12 @@ class OptimizedScalpingBot:
         ticker = self.config['TICKER']
         
         with st.spinner("🔍 Analyzing market..."):
-            # Get data
-            df = get_minute_data(ticker)
+            # Get data, indicators and signals
+            df, indicators, signals = _load_ticker_analysis(ticker)
             if df.empty:
                 st.error(f"❌ No data available for {ticker}")
                 return
             
-            # Calculate indicators
-            indicators = calc_indicators(df)
-            signals = check_signals(indicators)
-            
             # Display analysis
             st.subheader(f"📊 Quick Analysis for {ticker}")
             
@@ -605,24 +750,24 @@ class OptimizedScalpingBot:
                 st.metric("Volume Ratio", f"{indicators.get('volume_ratio', 0):.2f}")
             
             with col2:
-                signal_strength = signal_engine.get_signal_strength(indicators)
+                signal_strength = signal_engine.get_signal_strength(indicators, signals)
                 st.metric("Signal Strength", f"{signal_strength}/100")
                 
-                positive_signals = sum(signals.values())
-                st.metric("Positive Signals", f"{positive_signals}/{len(signals)}")
+                positive_signals = signal_mask(signals).bit_count()
+                st.metric("Positive Signals", f"{positive_signals}/{SIGNAL_COUNT}")
                 
-                confidence = signal_engine.get_signal_confidence(indicators)
+                confidence = signal_engine.get_signal_confidence(indicators, signals, signal_strength)
                 st.metric("Confidence", f"{confidence:.1%}")
             
             # Recommendation
-            if should_buy(indicators, self.config['MIN_SIGNAL_STRENGTH']):
+            if signal_engine.should_buy(indicators, self.config['MIN_SIGNAL_STRENGTH'], signals):
                 st.success("🎯 RECOMMENDATION: BUY - Strong signals detected")
             else:
                 st.info("⏳ RECOMMENDATION: WAIT - Insufficient signals")
     
     def clear_trade_history(self):
         """Clear trade history"""
-        self.session_state.trade_history = []
+        self.session_state.trade_history.clear()
         st.success("🗑️ Trade history cleared")
     
     def show_oauth_setup(self):
@@ -762,7 +907,8 @@ class OptimizedScalpingBot:
             dict: Token data or None if failed
         """
         try:
-            import requests
+            # Imported here: loading config.schwab_config sets up the token store
+            from config.schwab_config import TOKEN_TIMEOUT
             
             # Schwab OAuth token endpoint
             token_url = "https://api.schwabapi.com/v1/oauth/token"
@@ -785,7 +931,7 @@ class OptimizedScalpingBot:
             }
             
             # Make token request
-            response = requests.post(token_url, data=payload)
+            response = _token_session().post(token_url, data=payload, timeout=TOKEN_TIMEOUT)
             
             if response.status_code == 200:
                 token_data = response.json()
@@ -816,5 +962,11 @@ class OptimizedScalpingBot:
 
 # Initialize and run the bot
 if __name__ == "__main__":
+    # SECURE_MODE puts the same app behind the login gate instead of a separate entry point
+    if os.getenv("SECURE_MODE", "false").lower() in ("1", "true", "yes"):
+        from modules.secure_auth import get_secure_auth
+        if not get_secure_auth().show_secure_interface():
+            st.stop()
+    
     bot = OptimizedScalpingBot()
     bot.run() 
\ No newline at end of file
@@ -4,8 +4,8 @@ Automated Options Scalping Bot
 Real-time momentum-based options trading with Schwab API integration
 """
 
-import time
 import json
+import threading
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
@@ -43,6 +43,7 @@ class OptionsScalpingBot:
         
         # Bot state
         self.is_running = False
+        self._stop_event = threading.Event()
         self.current_position = None
         self.daily_pnl = 0.0
         self.trades_today = []
@@ -66,12 +67,13 @@ class OptionsScalpingBot:
             return False
         
         self.is_running = True
+        self._stop_event.clear()
         self.logger.info("Bot started - monitoring for opportunities")
         
         try:
             while self.is_running:
                 self.run_trading_cycle()
-                time.sleep(60)  # Check every minute
+                self._stop_event.wait(60)  # Check every minute, or return at once on stop()
                 
         except KeyboardInterrupt:
             self.logger.info("Bot stopped by user")
@@ -83,6 +85,7 @@ class OptionsScalpingBot:
     def stop(self):
         """Stop the bot"""
         self.is_running = False
+        self._stop_event.set()
         self.logger.info("Bot stopped")
     
     def check_auth(self) -> bool:
@@ -144,8 +147,8 @@ class OptionsScalpingBot:
             if data is None or data.empty:
                 return {'action': 'HOLD', 'confidence': 0, 'reason': 'No data'}
             
-            # Calculate technical indicators
-            indicators = self.indicators.calculate_all_indicators(data)
+            # Calculate the technical indicators the signal uses
+            indicators = self.indicators.calculate_signal_indicators(data)
             
             # Get sentiment
             sentiment_score = self.sentiment.get_sentiment_score(ticker)
@@ -4,6 +4,8 @@ Environment Configuration for Options Scalper
 """
 
 import os
+from functools import lru_cache
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -31,8 +33,9 @@ SCHWAB_TOKEN_URL = "https://api.schwabapi.com/v1/oauth/token"
 SCHWAB_CLIENT_LOGIN = "https://client.schwab.com/Areas/Access/Login"
 SCHWAB_ACCOUNT_SUMMARY = "https://client.schwab.com/app/accounts/positions/#/"
 
+@lru_cache(maxsize=1)
 def get_schwab_auth_url():
-    """Generate Schwab authorization URL"""
+    """Generate Schwab authorization URL (built once; the inputs are module constants)"""
     params = {
         'response_type': 'code',
         'client_id': SCHWAB_CLIENT_ID,
@@ -40,8 +43,7 @@ def get_schwab_auth_url():
         'redirect_uri': SCHWAB_REDIRECT_URI
     }
     
-    query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-    return f"{SCHWAB_AUTH_URL}?{query_string}"
+    return f"{SCHWAB_AUTH_URL}?{urlencode(params)}"
 
 def get_config():
     """Get complete configuration dictionary"""
@@ -4,12 +4,16 @@ Enhanced Schwab API Configuration for Options Scalping Bot
 """
 
 import os
-import json
+import orjson
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from cryptography.fernet import Fernet
 
+from utils.atomic_file import write_atomic
+
 # Schwab OAuth2 Configuration
 SCHWAB_CLIENT_ID = os.getenv("SCHWAB_CLIENT_ID", "")
 SCHWAB_CLIENT_SECRET = os.getenv("SCHWAB_CLIENT_SECRET", "")
@@ -24,6 +28,7 @@ SCHWAB_BASE_URL = "https://api.schwabapi.com/v1"
 SCHWAB_MARKET_DATA_URL = "https://api.schwabapi.com/v1/market-data"
 SCHWAB_QUOTES_URL = f"{SCHWAB_BASE_URL}/quotes"
 SCHWAB_OPTIONS_URL = f"{SCHWAB_BASE_URL}/options"
+SCHWAB_PRICE_HISTORY_URL = f"{SCHWAB_BASE_URL}/pricehistory"
 
 # Trading API
 SCHWAB_ACCOUNTS_URL = f"{SCHWAB_BASE_URL}/accounts"
@@ -33,6 +38,7 @@ SCHWAB_POSITIONS_URL = f"{SCHWAB_BASE_URL}/positions"
 # Token storage
 TOKEN_PATH = "config/schwab_tokens.json"
 ENCRYPTION_KEY_PATH = "config/encryption.key"
+TOKEN_TIMEOUT = (3, 10)  # (connect, read) seconds
 
 class SchwabConfig:
     """Enhanced Schwab API configuration manager"""
@@ -43,6 +49,18 @@ class SchwabConfig:
         self.redirect_uri = SCHWAB_REDIRECT_URI
         self.encryption_key = self._get_or_create_encryption_key()
         self.cipher = Fernet(self.encryption_key)
+        
+        # Keep-alive session shared by token exchange and refresh
+        self.session = requests.Session()
+        # Failed connections are retried for any method since nothing reached the server.
+        # POST stays out of allowed_methods: the auth code is single-use, so a token POST
+        # that got a response or a read error is never resent (429s retry idempotent calls only)
+        retries = Retry(total=3, connect=3, read=0, backoff_factor=0.3, status_forcelist=[429],
+                        raise_on_status=False)
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+        
+        # Decrypted tokens with the (mtime_ns, size) of the file they were read from
+        self._token_cache = None
     
     def _get_or_create_encryption_key(self) -> bytes:
         """Get or create encryption key for secure token storage"""
@@ -81,9 +99,9 @@ class SchwabConfig:
             "client_secret": self.client_secret
         }
         
-        response = requests.post(SCHWAB_TOKEN_URL, data=data)
+        response = self.session.post(SCHWAB_TOKEN_URL, data=data, timeout=TOKEN_TIMEOUT)
         if response.status_code == 200:
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             self._save_tokens(token_data)
             return token_data
         else:
@@ -98,9 +116,9 @@ class SchwabConfig:
             "client_secret": self.client_secret
         }
         
-        response = requests.post(SCHWAB_TOKEN_URL, data=data)
+        response = self.session.post(SCHWAB_TOKEN_URL, data=data, timeout=TOKEN_TIMEOUT)
         if response.status_code == 200:
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             self._save_tokens(token_data)
             return token_data
         else:
@@ -108,24 +126,41 @@ class SchwabConfig:
     
     def _save_tokens(self, token_data: Dict):
         """Save tokens securely with encryption"""
-        encrypted_data = self.cipher.encrypt(json.dumps(token_data).encode())
+        encrypted_data = self.cipher.encrypt(orjson.dumps(token_data))
         os.makedirs(os.path.dirname(TOKEN_PATH), exist_ok=True)
-        with open(TOKEN_PATH, 'wb') as f:
-            f.write(encrypted_data)
+        write_atomic(TOKEN_PATH, encrypted_data)
+        self._token_cache = (self._token_file_signature(), token_data)
+    
+    @staticmethod
+    def _token_file_signature():
+        """(mtime_ns, size) of the token file, or None if it does not exist"""
+        try:
+            stat = os.stat(TOKEN_PATH)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
     
     def load_tokens(self) -> Optional[Dict]:
         """Load tokens from secure storage"""
-        if not os.path.exists(TOKEN_PATH):
+        signature = self._token_file_signature()
+        if signature is None:
             return None
         
+        # Every API request asks for headers; only decrypt again when the file has changed
+        if self._token_cache is not None and self._token_cache[0] == signature:
+            return self._token_cache[1]
+        
         try:
             with open(TOKEN_PATH, 'rb') as f:
                 encrypted_data = f.read()
             decrypted_data = self.cipher.decrypt(encrypted_data)
-            return json.loads(decrypted_data.decode())
+            token_data = orjson.loads(decrypted_data)
         except Exception as e:
             print(f"Error loading tokens: {e}")
             return None
+        
+        self._token_cache = (signature, token_data)
+        return token_data
     
     def is_token_valid(self, token_data: Dict) -> bool:
         """Check if access token is still valid"""
@@ -195,6 +230,21 @@ class SchwabEndpoints:
             url += f"?expirationDate={expiration_date}"
         return url
     
+    @staticmethod
+    def get_price_history(symbol: str, period_type: str, period: int,
+                          frequency_type: str, frequency: int) -> str:
+        """Get price history (candles) endpoint"""
+        from urllib.parse import urlencode
+        
+        params = {
+            "symbol": symbol,
+            "periodType": period_type,
+            "period": period,
+            "frequencyType": frequency_type,
+            "frequency": frequency
+        }
+        return f"{SCHWAB_PRICE_HISTORY_URL}?{urlencode(params)}"
+    
     @staticmethod
     def place_order(account_id: str) -> str:
         """Place order endpoint"""
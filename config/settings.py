@@ -3,7 +3,8 @@ Optimized Configuration Settings for Options Scalping Application
 """
 
 import os
-import json
+import orjson
+from functools import lru_cache
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
 
@@ -11,6 +12,14 @@ from datetime import datetime, timedelta
 from dotenv import load_dotenv
 load_dotenv()
 
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Integer environment variable, falling back to default when unset or malformed"""
+    try:
+        value = int(os.getenv(name, default))
+    except ValueError:
+        value = default
+    return max(minimum, value)
+
 # Base configuration
 BASE_CONFIG = {
     "APP_NAME": "Options Scalping Dashboard",
@@ -51,7 +60,10 @@ API_CONFIG = {
 DATA_CONFIG = {
     "CACHE_DURATION": 300,  # 5 minutes
     "RATE_LIMIT_DELAY": 1.0,  # 1 second between requests
+    "PROVIDER_FAILURE_THRESHOLD": 3,  # Consecutive failures before a provider is skipped
+    "PROVIDER_COOLDOWN": 300,  # 5 minutes before a failing provider is retried
     "MAX_SYMBOLS_PER_BATCH": 5,
+    "MAX_WORKERS": _env_int("DATA_FETCH_WORKERS", 8),  # Concurrent fetch threads
     "BATCH_DELAY": 1.0,
     "RETRY_ATTEMPTS": 3,
     "RETRY_DELAY": 2.0,
@@ -336,14 +348,23 @@ DEV_CONFIG = {
     "TEST_MODE": False
 }
 
+@lru_cache(maxsize=8)
+def load_json_config(path: str = "config.json") -> Dict[str, Any]:
+    """Parse a JSON config file once per process (empty dict if missing)
+    
+    The result is shared between callers and must be treated as read-only.
+    Call load_json_config.cache_clear() after writing the file.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
 # Load custom configuration from file if exists
 def load_custom_config() -> Dict[str, Any]:
     """Load custom configuration from config.json"""
     try:
-        if os.path.exists("config.json"):
-            with open("config.json", "r") as f:
-                custom_config = json.load(f)
-                return custom_config
+        return load_json_config("config.json")
     except Exception as e:
         print(f"Warning: Could not load custom config: {e}")
     return {}
@@ -389,16 +410,17 @@ def update_config(section: str, updates: Dict[str, Any]) -> bool:
         if not os.path.exists("config.json"):
             config_data = {}
         else:
-            with open("config.json", "r") as f:
-                config_data = json.load(f)
+            with open("config.json", "rb") as f:
+                config_data = orjson.loads(f.read())
         
         if section.lower() not in config_data:
             config_data[section.lower()] = {}
         
         config_data[section.lower()].update(updates)
         
-        with open("config.json", "w") as f:
-            json.dump(config_data, f, indent=2)
+        with open("config.json", "wb") as f:
+            f.write(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
+        load_json_config.cache_clear()
         
         return True
     except Exception as e:
@@ -3,22 +3,47 @@
 Optimized Data Fetcher for Options Scalping Application
 """
 
-import json
+import os
 import time
 import logging
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 import pandas as pd
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 from functools import lru_cache
-import asyncio
-import aiohttp
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 # Import configuration
-from config.settings import API_CONFIG, DATA_CONFIG
+from config.settings import API_CONFIG, DATA_CONFIG, load_json_config
 
 logger = logging.getLogger(__name__)
 
+# Polygon snapshot: quotes for many (or all) tickers in one request
+POLYGON_SNAPSHOT_URL = "https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/tickers"
+
+# Pooled HTTP session so REST calls reuse the TLS connection
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Broker (Schwab/TOS) quote field -> normalized quote field
+_BROKER_QUOTE_FIELDS = (
+    ("price", "price"),
+    ("change", "change"),
+    ("changePercent", "change_percent"),
+    ("volume", "volume"),
+)
+
+def _normalize_broker_quote(symbol: str, quote_data: Dict, source: str) -> Dict:
+    """Translate a Schwab/TOS quote payload into the fetcher's quote dict"""
+    get = quote_data.get
+    quote = {field: get(key, 0) for key, field in _BROKER_QUOTE_FIELDS}
+    quote["symbol"] = symbol
+    quote["data_source"] = source
+    quote["timestamp"] = datetime.now().isoformat()
+    return quote
+
 class OptimizedDataFetcher:
     """Optimized data fetcher with caching, async support, and efficient rate limiting"""
     
@@ -28,6 +53,7 @@ class OptimizedDataFetcher:
         self.use_alpaca = use_alpaca
         self.use_tos = use_tos
         self.use_polygon = use_polygon
+        self.polygon_api_key = os.getenv("POLYGON_API_KEY", "")
         
         # Schwab API credentials
         self.schwab_market_data_key = None
@@ -49,6 +75,16 @@ class OptimizedDataFetcher:
         self.request_timestamps = {}
         self.rate_limit_delay = DATA_CONFIG.get("RATE_LIMIT_DELAY", 1.0)
         
+        # Circuit breaker: a provider that keeps failing is skipped for a cooldown
+        self.provider_failures = {}
+        self.provider_retry_at = {}
+        self.provider_failure_threshold = DATA_CONFIG.get("PROVIDER_FAILURE_THRESHOLD", 3)
+        self.provider_cooldown = DATA_CONFIG.get("PROVIDER_COOLDOWN", 300)  # 5 minutes
+        
+        # Long-lived worker pool for concurrent quote fetches
+        self.executor = ThreadPoolExecutor(max_workers=DATA_CONFIG.get("MAX_WORKERS", 8),
+                                           thread_name_prefix="quote-fetch")
+        
         # Data source priority
         self.data_source = "yfinance"
         
@@ -60,20 +96,18 @@ class OptimizedDataFetcher:
     def _load_api_keys(self):
         """Load API keys from config file"""
         try:
-            with open('config.json', 'r') as f:
-                config = json.load(f)
-                api_keys = config.get('api_keys', {})
-                
-                # Schwab Market Data API
-                self.schwab_market_data_key = api_keys.get('schwab_market_data_key', '')
-                self.schwab_market_data_secret = api_keys.get('schwab_market_data_secret', '')
-                
-                # Schwab Trading API
-                self.schwab_trading_key = api_keys.get('schwab_trading_key', '')
-                self.schwab_trading_secret = api_keys.get('schwab_trading_secret', '')
-                
+            api_keys = load_json_config('config.json').get('api_keys', {})
+            
+            # Schwab Market Data API
+            self.schwab_market_data_key = api_keys.get('schwab_market_data_key', '')
+            self.schwab_market_data_secret = api_keys.get('schwab_market_data_secret', '')
+            
+            # Schwab Trading API
+            self.schwab_trading_key = api_keys.get('schwab_trading_key', '')
+            self.schwab_trading_secret = api_keys.get('schwab_trading_secret', '')
+            
         except Exception as e:
-            logger.error(f"Error loading API keys: {e}")
+            logger.error("Error loading API keys: %s", e)
             self.schwab_market_data_key = ''
             self.schwab_market_data_secret = ''
             self.schwab_trading_key = ''
@@ -86,14 +120,13 @@ class OptimizedDataFetcher:
             # Initialize Polygon.io
             try:
                 from data.polygon_data import initialize_polygon
-                    polygon_api_key = os.getenv("POLYGON_API_KEY", "")  # Load from environment variable
-    if polygon_api_key:
-        initialize_polygon(polygon_api_key)
+                if self.polygon_api_key:
+                    initialize_polygon(self.polygon_api_key)
                 self.data_source = "polygon"
                 logger.info("✅ Using Polygon.io as data source")
                 return
             except Exception as e:
-                logger.warning(f"Failed to initialize Polygon.io: {e}")
+                logger.warning("Failed to initialize Polygon.io: %s", e)
         
         if (self.use_alpaca and API_CONFIG["ALPACA"]["API_KEY"] and 
             API_CONFIG["ALPACA"]["API_KEY"] != "your_alpaca_api_key_here"):
@@ -139,7 +172,7 @@ class OptimizedDataFetcher:
             )
             logger.info("✅ Alpaca clients initialized")
         except Exception as e:
-            logger.warning(f"⚠️ Failed to initialize Alpaca: {e}")
+            logger.warning("⚠️ Failed to initialize Alpaca: %s", e)
     
     def _initialize_tos(self):
         """Initialize ThinkOrSwim client"""
@@ -149,7 +182,7 @@ class OptimizedDataFetcher:
             if self.tos_client:
                 logger.info("✅ ThinkOrSwim client initialized")
         except Exception as e:
-            logger.warning(f"⚠️ Failed to initialize ThinkOrSwim: {e}")
+            logger.warning("⚠️ Failed to initialize ThinkOrSwim: %s", e)
     
     def _check_cache(self, key: str) -> Optional[Dict]:
         """Check if data is cached and still valid"""
@@ -168,6 +201,24 @@ class OptimizedDataFetcher:
         self.cache[key] = data
         self.cache_timestamps[key] = time.time()
     
+    def _provider_available(self, source: str) -> bool:
+        """Check whether the circuit breaker allows requests to a provider"""
+        return time.time() >= self.provider_retry_at.get(source, 0)
+    
+    def _record_provider_result(self, source: str, success: bool):
+        """Update the circuit breaker after a provider request"""
+        if success:
+            self.provider_failures.pop(source, None)
+            return
+        
+        failures = self.provider_failures.get(source, 0) + 1
+        self.provider_failures[source] = failures
+        if failures >= self.provider_failure_threshold:
+            self.provider_failures.pop(source, None)
+            self.provider_retry_at[source] = time.time() + self.provider_cooldown
+            logger.warning("⚠️ %s failed %d times in a row, skipping it for %ss",
+                           source, failures, self.provider_cooldown)
+    
     def _rate_limit(self, source: str):
         """Implement rate limiting"""
         current_time = time.time()
@@ -184,8 +235,8 @@ class OptimizedDataFetcher:
         """Get stock data with caching"""
         cache_key = f"stock_data_{symbol}_{interval}_{period}"
         cached_data = self._check_cache(cache_key)
-        if cached_data:
-            return pd.DataFrame(cached_data)
+        if cached_data is not None:
+            return cached_data
         
         # Get data based on source
         if self.data_source == "polygon":
@@ -200,7 +251,9 @@ class OptimizedDataFetcher:
             data = self._get_yfinance_stock_data(symbol, interval, period)
         
         if data is not None and not data.empty:
-            self._update_cache(cache_key, data.to_dict('records'))
+            # Cache the frame itself; a records round-trip rebuilds it row by row
+            # and drops the DatetimeIndex
+            self._update_cache(cache_key, data)
         
         return data
     
@@ -211,38 +264,41 @@ class OptimizedDataFetcher:
         if cached_quote:
             return cached_quote
         
-        # Try to get quote based on source
+        # Try to get quote based on source, unless its circuit breaker is open
         quote = None
         
-        if self.data_source == "polygon":
-            quote = self._get_polygon_quote(symbol)
-        elif self.data_source == "alpaca":
-            quote = self._get_alpaca_quote(symbol)
-        elif self.data_source == "schwab":
-            quote = self._get_schwab_quote(symbol)
-        elif self.data_source == "thinkorswim":
-            quote = self._get_tos_quote(symbol)
-        else:
-            quote = self._get_yfinance_quote(symbol)
+        if self._provider_available(self.data_source):
+            if self.data_source == "polygon":
+                quote = self._get_polygon_quote(symbol)
+            elif self.data_source == "alpaca":
+                quote = self._get_alpaca_quote(symbol)
+            elif self.data_source == "schwab":
+                quote = self._get_schwab_quote(symbol)
+            elif self.data_source == "thinkorswim":
+                quote = self._get_tos_quote(symbol)
+            else:
+                quote = self._get_yfinance_quote(symbol)
+            self._record_provider_result(self.data_source, bool(quote))
         
         # If no quote from primary source, try fallback
         if not quote:
-            if self.data_source != "yfinance":
+            if self.data_source != "yfinance" and self._provider_available("yfinance"):
                 quote = self._get_yfinance_quote(symbol)
+                self._record_provider_result("yfinance", bool(quote))
             if not quote:
                 # Final fallback to mock data
                 try:
                     from data.mock_data import mock_data_provider
                     quote = mock_data_provider.get_mock_quote(symbol)
                     if quote:
-                        logger.warning(f"⚠️ No data from {self.data_source} for {symbol}, using mock data")
+                        logger.warning("⚠️ No data from %s for %s, using mock data", self.data_source, symbol)
                 except Exception as e:
-                    logger.error(f"Error fetching data for {symbol}: {e}")
+                    logger.error("Error fetching data for %s: %s", symbol, e)
                     quote = None
         
         # If no quote from primary source, fallback to mock data
         if not quote:
-            logger.warning(f"⚠️ No data from {self.data_source} for {symbol}, using mock data")
+            logger.warning("⚠️ No data from %s for %s, using mock data", self.data_source, symbol)
             from data.mock_data import mock_data_provider
             quote = mock_data_provider.get_mock_quote(symbol)
         
@@ -253,39 +309,93 @@ class OptimizedDataFetcher:
     
     def get_market_data_batch(self, symbols: List[str]) -> Dict[str, Dict]:
         """Get market data for multiple symbols efficiently"""
+        # Limit to smaller batch size to avoid overwhelming APIs
+        symbols = symbols[:DATA_CONFIG.get("MAX_SYMBOLS_PER_BATCH", 5)]
+        
+        # One snapshot request fills the quote cache; the per-symbol path below
+        # then only goes to the network for symbols the snapshot missed
+        self.get_snapshot_all([symbol for symbol in symbols if not self._check_cache(f"quote_{symbol}")])
+        
+        # Fan the quotes out on the fetcher's pool; the clients block, so threads
+        # give the concurrency without building an event loop per call
         results = {}
+        futures = [self.executor.submit(self.get_real_time_quote, symbol) for symbol in symbols]
+        for symbol, future in zip(symbols, futures):
+            try:
+                quote = future.result()
+            except Exception as e:
+                logger.error("Error fetching data for %s: %s", symbol, e)
+                quote = self._get_mock_fallback_quote(symbol)
+            if quote:
+                results[symbol] = quote
         
-        # Limit to smaller batch size to avoid overwhelming APIs
-        symbols = symbols[:5]  # Limit to 5 symbols at a time
-        
-        # Use ThreadPoolExecutor for parallel processing with reduced workers
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Submit all requests
-            future_to_symbol = {
-                executor.submit(self.get_real_time_quote, symbol): symbol 
-                for symbol in symbols
-            }
+        return results
+    
+    def get_snapshot_all(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Quotes for many tickers from a single Polygon snapshot request
+        
+        Args:
+            symbols: Tickers to request; None for the whole US stock market
+        
+        Returns:
+            dict: Quote per ticker (also stored in the quote cache); empty if
+            Polygon is not configured, unavailable or nothing was requested
+        """
+        if symbols is not None and not symbols:
+            return {}
+        if not (self.use_polygon and self.polygon_api_key) or not self._provider_available("polygon_snapshot"):
+            return {}
+        
+        params = {"apiKey": self.polygon_api_key}
+        if symbols is not None:
+            params["tickers"] = ",".join(symbols)
+        
+        try:
+            self._rate_limit("polygon")
+            response = _session.get(POLYGON_SNAPSHOT_URL, params=params, timeout=DATA_CONFIG.get("TIMEOUT", 30))
+            response.raise_for_status()
+            tickers = orjson.loads(response.content).get("tickers") or []
+        except Exception as e:
+            logger.error("Error fetching Polygon snapshot: %s", e)
+            self._record_provider_result("polygon_snapshot", False)
+            return {}
+        
+        self._record_provider_result("polygon_snapshot", True)
+        timestamp = datetime.now().isoformat()
+        quotes = {}
+        for entry in tickers:
+            symbol = entry.get("ticker")
+            day = entry.get("day") or {}
+            price = (entry.get("lastTrade") or {}).get("p") or day.get("c")
+            if not symbol or not price:
+                continue
             
-            # Collect results as they complete
-            for future in as_completed(future_to_symbol):
-                symbol = future_to_symbol[future]
-                try:
-                    quote = future.result()
-                    if quote:
-                        results[symbol] = quote
-                except Exception as e:
-                    logger.error(f"Error fetching data for {symbol}: {e}")
-                    # Add mock data as fallback
-                    try:
-                        from data.mock_data import mock_data_provider
-                        mock_quote = mock_data_provider.get_mock_quote(symbol)
-                        if mock_quote:
-                            mock_quote['source'] = 'mock'
-                            results[symbol] = mock_quote
-                    except Exception as mock_error:
-                        logger.error(f"Error getting mock data for {symbol}: {mock_error}")
+            quote = {
+                "symbol": symbol,
+                "price": price,
+                "previous_close": (entry.get("prevDay") or {}).get("c", 0),
+                "change": entry.get("todaysChange", 0),
+                "change_percent": entry.get("todaysChangePerc", 0),
+                "volume": day.get("v", 0),
+                "data_source": "polygon",
+                "timestamp": timestamp
+            }
+            quotes[symbol] = quote
+            self._update_cache(f"quote_{symbol}", quote)
         
-        return results
+        return quotes
+    
+    def _get_mock_fallback_quote(self, symbol: str) -> Optional[Dict]:
+        """Mock quote used when a provider request raises"""
+        try:
+            from data.mock_data import mock_data_provider
+            mock_quote = mock_data_provider.get_mock_quote(symbol)
+            if mock_quote:
+                mock_quote['source'] = 'mock'
+            return mock_quote
+        except Exception as mock_error:
+            logger.error("Error getting mock data for %s: %s", symbol, mock_error)
+            return None
     
     def _get_yfinance_quote(self, symbol: str) -> Optional[Dict]:
         """Get real-time quote from Yahoo Finance with optimized retry logic"""
@@ -297,13 +407,18 @@ class OptimizedDataFetcher:
         for attempt in range(max_retries):
             try:
                 import yfinance as yf
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
+                from utils.http_session import YF_SESSION
+                ticker = yf.Ticker(symbol, session=YF_SESSION)
+                # Bind the lookup once; info is a large dict and is read field by field
+                get = ticker.info.get
                 
-                current_price = info.get('regularMarketPrice', 0)
-                previous_close = info.get('regularMarketPreviousClose', current_price)
-                change = current_price - previous_close if previous_close else 0
-                change_percent = (change / previous_close * 100) if previous_close else 0
+                current_price = get('regularMarketPrice', 0)
+                previous_close = get('regularMarketPreviousClose', current_price)
+                if previous_close:
+                    change = current_price - previous_close
+                    change_percent = change / previous_close * 100
+                else:
+                    change = change_percent = 0
                 
                 quote_data = {
                     "symbol": symbol,
@@ -311,10 +426,10 @@ class OptimizedDataFetcher:
                     "previous_close": previous_close,
                     "change": change,
                     "change_percent": change_percent,
-                    "volume": info.get('volume', 0),
-                    "avg_volume": info.get('averageVolume', 0),
-                    "market_cap": info.get('marketCap', 0),
-                    "pe_ratio": info.get('trailingPE', 0),
+                    "volume": get('volume', 0),
+                    "avg_volume": get('averageVolume', 0),
+                    "market_cap": get('marketCap', 0),
+                    "pe_ratio": get('trailingPE', 0),
                     "data_source": "yfinance",
                     "timestamp": datetime.now().isoformat()
                 }
@@ -325,16 +440,16 @@ class OptimizedDataFetcher:
                 error_msg = str(e).lower()
                 if "rate limited" in error_msg or "too many requests" in error_msg:
                     if attempt < max_retries - 1:
-                        logger.warning(f"⚠️ yfinance rate limited for {symbol}, retrying in {retry_delay}s")
+                        logger.warning("⚠️ yfinance rate limited for %s, retrying in %ss", symbol, retry_delay)
                         time.sleep(retry_delay)
                         retry_delay *= 2
                         continue
                     else:
-                        logger.warning(f"⚠️ yfinance rate limited for {symbol}, using mock data")
-                        from data.mock_data import mock_data_provider
-                        return mock_data_provider.get_mock_quote(symbol)
+                        # Report the failure so the circuit breaker sees it; the caller falls back to mock data
+                        logger.warning("⚠️ yfinance rate limited for %s, giving up after %s attempts", symbol, max_retries)
+                        return None
                 else:
-                    logger.error(f"❌ yfinance error for {symbol}: {e}")
+                    logger.error("❌ yfinance error for %s: %s", symbol, e)
                     return None
         
         return None
@@ -345,6 +460,7 @@ class OptimizedDataFetcher:
         
         try:
             import yfinance as yf
+            from utils.http_session import YF_SESSION
             
             # Map intervals
             interval_map = {
@@ -353,7 +469,7 @@ class OptimizedDataFetcher:
             }
             yf_interval = interval_map.get(interval, "1d")
             
-            ticker = yf.Ticker(symbol)
+            ticker = yf.Ticker(symbol, session=YF_SESSION)
             data = ticker.history(period=period, interval=yf_interval, prepost=True)
             
             if data.empty:
@@ -365,7 +481,7 @@ class OptimizedDataFetcher:
             return data
             
         except Exception as e:
-            logger.error(f"Error fetching yfinance data for {symbol}: {e}")
+            logger.error("Error fetching yfinance data for %s: %s", symbol, e)
             return None
     
     def _get_alpaca_stock_data(self, symbol: str, interval: str, period: str) -> Optional[pd.DataFrame]:
@@ -407,7 +523,7 @@ class OptimizedDataFetcher:
             return None
             
         except Exception as e:
-            logger.error(f"Error fetching Alpaca data for {symbol}: {e}")
+            logger.error("Error fetching Alpaca data for %s: %s", symbol, e)
             return None
     
     def _get_alpaca_quote(self, symbol: str) -> Optional[Dict]:
@@ -436,7 +552,7 @@ class OptimizedDataFetcher:
             return None
             
         except Exception as e:
-            logger.error(f"Error fetching Alpaca quote for {symbol}: {e}")
+            logger.error("Error fetching Alpaca quote for %s: %s", symbol, e)
             return None
     
     def _get_schwab_stock_data(self, symbol: str, interval: str, period: str) -> Optional[pd.DataFrame]:
@@ -452,7 +568,7 @@ class OptimizedDataFetcher:
             return None
             
         except Exception as e:
-            logger.error(f"Error fetching Schwab data for {symbol}: {e}")
+            logger.error("Error fetching Schwab data for %s: %s", symbol, e)
             return None
     
     def _get_schwab_quote(self, symbol: str) -> Optional[Dict]:
@@ -463,20 +579,12 @@ class OptimizedDataFetcher:
             quote_data = client.get_quote(symbol)
             
             if quote_data:
-                return {
-                    "symbol": symbol,
-                    "price": quote_data.get('price', 0),
-                    "change": quote_data.get('change', 0),
-                    "change_percent": quote_data.get('changePercent', 0),
-                    "volume": quote_data.get('volume', 0),
-                    "data_source": "schwab",
-                    "timestamp": datetime.now().isoformat()
-                }
+                return _normalize_broker_quote(symbol, quote_data, "schwab")
             
             return None
             
         except Exception as e:
-            logger.error(f"Error fetching Schwab quote for {symbol}: {e}")
+            logger.error("Error fetching Schwab quote for %s: %s", symbol, e)
             return None
     
     def _get_tos_stock_data(self, symbol: str, interval: str, period: str) -> Optional[pd.DataFrame]:
@@ -489,7 +597,7 @@ class OptimizedDataFetcher:
             return data
             
         except Exception as e:
-            logger.error(f"Error fetching TOS data for {symbol}: {e}")
+            logger.error("Error fetching TOS data for %s: %s", symbol, e)
             return None
     
     def _get_polygon_quote(self, symbol: str) -> Optional[Dict]:
@@ -498,11 +606,11 @@ class OptimizedDataFetcher:
             from data.polygon_data import get_polygon_quote
             quote = get_polygon_quote(symbol)
             if quote:
-                logger.info(f"✅ Polygon.io quote for {symbol}: ${quote.get('price', 0):.2f}")
+                logger.info("✅ Polygon.io quote for %s: $%.2f", symbol, quote.get('price', 0))
             return quote
             
         except Exception as e:
-            logger.error(f"Error fetching Polygon quote for {symbol}: {e}")
+            logger.error("Error fetching Polygon quote for %s: %s", symbol, e)
             return None
     
     def _get_polygon_stock_data(self, symbol: str, interval: str, period: str) -> Optional[pd.DataFrame]:
@@ -511,11 +619,11 @@ class OptimizedDataFetcher:
             from data.polygon_data import get_polygon_data
             data = get_polygon_data(symbol, interval, period)
             if data is not None and not data.empty:
-                logger.info(f"✅ Polygon.io data for {symbol}: {len(data)} records")
+                logger.info("✅ Polygon.io data for %s: %s records", symbol, len(data))
             return data
             
         except Exception as e:
-            logger.error(f"Error fetching Polygon data for {symbol}: {e}")
+            logger.error("Error fetching Polygon data for %s: %s", symbol, e)
             return None
     
     def _get_tos_quote(self, symbol: str) -> Optional[Dict]:
@@ -527,20 +635,12 @@ class OptimizedDataFetcher:
             quote_data = self.tos_client.get_quote(symbol)
             
             if quote_data:
-                return {
-                    "symbol": symbol,
-                    "price": quote_data.get('price', 0),
-                    "change": quote_data.get('change', 0),
-                    "change_percent": quote_data.get('changePercent', 0),
-                    "volume": quote_data.get('volume', 0),
-                    "data_source": "thinkorswim",
-                    "timestamp": datetime.now().isoformat()
-                }
+                return _normalize_broker_quote(symbol, quote_data, "thinkorswim")
             
             return None
             
         except Exception as e:
-            logger.error(f"Error fetching TOS quote for {symbol}: {e}")
+            logger.error("Error fetching TOS quote for %s: %s", symbol, e)
             return None
     
     def get_data_source(self) -> str:
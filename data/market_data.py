@@ -8,6 +8,8 @@ import pandas as pd
 from datetime import datetime, timedelta
 import streamlit as st
 
+from utils.http_session import YF_SESSION
+
 class MarketData:
     def __init__(self):
         self.cache = {}
@@ -24,7 +26,7 @@ class MarketData:
                 return cached_data
         
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = yf.Ticker(symbol, session=YF_SESSION)
             data = ticker.history(period=period)
             
             # Cache the data
@@ -38,7 +40,7 @@ class MarketData:
     def get_real_time_quote(self, symbol):
         """Get real-time quote"""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = yf.Ticker(symbol, session=YF_SESSION)
             info = ticker.info
             
             return {
@@ -57,14 +59,50 @@ class MarketData:
     def get_market_data_batch(self, symbols, period="1mo"):
         """Get market data for multiple symbols"""
         results = {}
+        missing = []
         
+        # Serve fresh cache entries, collect the rest for one batch download
         for symbol in symbols:
-            data = self.get_stock_data(symbol, period)
-            if data is not None and not data.empty:
+            cached = self.cache.get(f"{symbol}_{period}")
+            if cached and datetime.now() - cached[1] < timedelta(seconds=self.cache_duration):
+                if cached[0] is not None and not cached[0].empty:
+                    results[symbol] = cached[0]
+            else:
+                missing.append(symbol)
+        
+        if not missing:
+            return results
+        
+        try:
+            batch = yf.download(missing, period=period, group_by='ticker', auto_adjust=True,
+                                threads=True, progress=False, session=YF_SESSION)
+        except Exception as e:
+            st.error(f"Error fetching batch data for {', '.join(missing)}: {e}")
+            return results
+        
+        downloaded = []
+        for symbol in missing:
+            if isinstance(batch.columns, pd.MultiIndex):
+                if symbol not in batch.columns.get_level_values(0):
+                    continue
+                data = batch[symbol]
+            else:
+                data = batch
+            
+            # Symbols with a shorter history are NaN-padded to the batch index
+            data = data.dropna(how='all')
+            downloaded.append((symbol, period, data))
+            if not data.empty:
                 results[symbol] = data
         
+        self.cache_batch(downloaded)
         return results
     
+    def cache_batch(self, items):
+        """Insert or replace cache entries for (symbol, period, data) items in one update"""
+        fetched_at = datetime.now()
+        self.cache.update({f"{symbol}_{period}": (data, fetched_at) for symbol, period, data in items})
+    
     def clear_cache(self):
         """Clear the data cache"""
         self.cache.clear()
@@ -7,14 +7,22 @@ import random
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
+import numpy as np
 import pandas as pd
 
+# Minute bars generated per period
+_PERIOD_MINUTES = {
+    "1d": 390,   # Market hours in minutes
+    "1w": 1950,  # 5 days * 390 minutes
+    "1m": 7800,  # ~20 trading days * 390 minutes
+}
+
 class MockDataProvider:
     """Provides realistic mock market data when APIs are rate limited"""
     
     def __init__(self):
         # Realistic base prices (as of recent market data)
-        self.base_prices = {
+        base_prices = {
             "AAPL": 175.50,
             "MSFT": 380.25,
             "GOOGL": 140.75,
@@ -32,26 +40,48 @@ class MockDataProvider:
             "CRM": 245.60
         }
         
+        # Current prices live in one float64 array indexed by symbol
+        self._sym_idx = {s: i for i, s in enumerate(base_prices)}
+        self._prices = np.array(list(base_prices.values()), dtype=np.float64)
+        
         # Market volatility (percentage)
         self.volatility = 0.02  # 2% volatility
         
+        # Generator for the price paths, drawn a whole series at a time
+        self.rng = np.random.default_rng()
+    
+    @property
+    def base_prices(self) -> Dict[str, float]:
+        """Snapshot of the current price per symbol"""
+        return dict(zip(self._sym_idx, self._prices.tolist()))
+    
+    def _symbol_index(self, symbol: str) -> int:
+        """Index of symbol in the price array, adding unknown symbols at 100.0"""
+        idx = self._sym_idx.get(symbol)
+        if idx is None:
+            idx = len(self._prices)
+            self._sym_idx[symbol] = idx
+            self._prices = np.append(self._prices, 100.0)
+        return idx
+    
     def get_realistic_price(self, symbol: str) -> float:
         """Generate a realistic price for a symbol"""
-        base_price = self.base_prices.get(symbol, 100.0)
-        
-        # Add some realistic movement
-        movement = random.gauss(0, self.volatility)
-        new_price = base_price * (1 + movement)
+        idx = self._symbol_index(symbol)
         
-        # Update base price for next call
-        self.base_prices[symbol] = new_price
+        # Add some realistic movement and keep it as the base for the next call
+        self._prices[idx] *= 1 + random.gauss(0, self.volatility)
         
-        return round(new_price, 2)
+        return round(float(self._prices[idx]), 2)
     
     def get_mock_quote(self, symbol: str) -> Dict:
         """Get a realistic mock quote"""
-        current_price = self.get_realistic_price(symbol)
-        previous_close = self.base_prices.get(symbol, current_price) * 0.995  # Slight difference
+        self.get_realistic_price(symbol)
+        return self._build_quote(symbol, float(self._prices[self._sym_idx[symbol]]))
+    
+    def _build_quote(self, symbol: str, price: float) -> Dict:
+        """Quote dict around a freshly moved price"""
+        current_price = round(price, 2)
+        previous_close = price * 0.995  # Slight difference
         
         change = current_price - previous_close
         change_percent = (change / previous_close) * 100
@@ -77,66 +107,85 @@ class MockDataProvider:
         current_price = self.get_realistic_price(symbol)
         
         # Generate data points
-        if period == "1d":
-            data_points = 390  # Market hours in minutes
-        elif period == "1w":
-            data_points = 1950  # 5 days * 390 minutes
-        elif period == "1m":
-            data_points = 7800  # ~20 trading days * 390 minutes
-        else:
-            data_points = 390
+        data_points = _PERIOD_MINUTES.get(period, 390)
         
         # Generate time series
-        end_time = datetime.now()
-        start_time = end_time - timedelta(minutes=data_points)
-        
-        # Create time index
-        time_index = pd.date_range(start=start_time, end=end_time, periods=data_points)
-        
-        # Generate price data with realistic movement
-        prices = []
-        current = current_price
-        
-        for i in range(data_points):
-            # Add some trend and noise
-            trend = random.gauss(0, 0.001)  # Small trend
-            noise = random.gauss(0, 0.005)  # Price noise
-            current = current * (1 + trend + noise)
-            prices.append(current)
-        
-        # Create OHLC data
-        data = []
-        for i in range(0, len(prices), 5):  # 5-minute candles
-            if i + 4 < len(prices):
-                candle_prices = prices[i:i+5]
-                open_price = candle_prices[0]
-                high_price = max(candle_prices)
-                low_price = min(candle_prices)
-                close_price = candle_prices[-1]
-                volume = random.randint(100000, 1000000)
-                
-                data.append({
-                    'Open': round(open_price, 2),
-                    'High': round(high_price, 2),
-                    'Low': round(low_price, 2),
-                    'Close': round(close_price, 2),
-                    'Volume': volume
-                })
-        
-        df = pd.DataFrame(data)
-        df.index = pd.date_range(start=start_time, end=end_time, periods=len(df))
+        start_time = datetime.now() - timedelta(minutes=data_points)
+        
+        # Generate price data with realistic movement: a small trend and price
+        # noise per minute, compounded over the whole path at once
+        trend = self.rng.standard_normal(data_points) * 0.001
+        noise = self.rng.standard_normal(data_points) * 0.005
+        prices = current_price * np.cumprod(1.0 + trend + noise)
+        
+        # Create OHLC data: one row per complete 5-minute candle, built by column
+        num_candles = data_points // 5
+        candles = prices[:num_candles * 5].reshape(num_candles, 5)
+        
+        df = pd.DataFrame({
+            'Open': candles[:, 0].round(2),
+            'High': candles.max(axis=1).round(2),
+            'Low': candles.min(axis=1).round(2),
+            'Close': candles[:, -1].round(2),
+            'Volume': self.rng.integers(100000, 1000000, num_candles, endpoint=True)
+        }, index=pd.date_range(start=start_time, periods=num_candles, freq='5min'))
         
         return df
     
-    def get_mock_market_data_batch(self, symbols: list) -> Dict[str, Dict]:
-        """Get mock data for multiple symbols"""
-        results = {}
-        
-        for symbol in symbols:
-            results[symbol] = self.get_mock_quote(symbol)
-            time.sleep(0.1)  # Small delay to simulate processing
+    def get_mock_market_data_batch(self, symbols: list, simulate_latency: bool = False) -> Dict[str, Dict]:
+        """Get mock data for multiple symbols
+        
+        Args:
+            symbols (list): Symbols to quote
+            simulate_latency (bool): Sleep 100ms per symbol, as a real provider would take
+        """
+        if simulate_latency:
+            results = {}
+            for symbol in symbols:
+                results[symbol] = self.get_mock_quote(symbol)
+                time.sleep(0.1)
+            return results
+        
+        # Move every requested price with one normal draw and one array multiply
+        n = len(symbols)
+        idxs = np.fromiter((self._symbol_index(symbol) for symbol in symbols), dtype=np.intp, count=n)
+        self._prices[idxs] *= 1.0 + self.rng.standard_normal(n) * self.volatility
+        
+        # Same fields as _build_quote, computed for all symbols at once
+        prices = self._prices[idxs]
+        current_price = prices.round(2)
+        previous_close = prices * 0.995  # Slight difference
+        change = current_price - previous_close
+        volume = self.rng.integers(1000000, 10000000, n, endpoint=True)
+        columns = zip(
+            symbols,
+            current_price.tolist(),
+            previous_close.round(2).tolist(),
+            change.round(2).tolist(),
+            (change / previous_close * 100).round(2).tolist(),
+            volume.tolist(),
+            (volume * self.rng.uniform(0.8, 1.2, n)).tolist(),
+            (current_price * self.rng.integers(1000000, 10000000, n, endpoint=True)).tolist(),
+            self.rng.uniform(15, 35, n).tolist()
+        )
+        timestamp = datetime.now().isoformat()
         
-        return results
+        return {
+            symbol: {
+                "symbol": symbol,
+                "price": price,
+                "previous_close": prev,
+                "change": chg,
+                "change_percent": chg_pct,
+                "volume": vol,
+                "avg_volume": avg_vol,
+                "market_cap": market_cap,
+                "pe_ratio": pe_ratio,
+                "data_source": "mock_data",
+                "timestamp": timestamp
+            }
+            for symbol, price, prev, chg, chg_pct, vol, avg_vol, market_cap, pe_ratio in columns
+        }
 
 # Global instance
 mock_data_provider = MockDataProvider() 
\ No newline at end of file
@@ -10,23 +10,27 @@ import numpy as np
 from datetime import datetime, timedelta
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import warnings
-import asyncio
-import aiohttp
 from functools import lru_cache
 import logging
 
+from utils.http_session import YF_SESSION
+
 warnings.filterwarnings('ignore')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# yfinance's HTTP client logs every connection at INFO
+logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+@dataclass(slots=True)
 class MarketData:
-    """Structured market data"""
+    """Structured market data (slotted: no per-instance __dict__)"""
     ticker: str
     price: float
     volume: int
@@ -48,6 +52,9 @@ class OptimizedDataFetcher:
         self.session = None
         self.lock = threading.Lock()
         
+        # Long-lived worker pool for batch fetches; capped to avoid throttling
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="minute-fetch")
+        
         # Performance metrics
         self.metrics = {
             'requests_made': 0,
@@ -98,7 +105,7 @@ class OptimizedDataFetcher:
         with self.lock:
             if cache_key in self.cache and self._is_cache_valid(self.cache[cache_key]):
                 self.metrics['cache_hits'] += 1
-                logger.info(f"📊 Cache hit for {ticker}")
+                logger.info("📊 Cache hit for %s", ticker)
                 return self.cache[cache_key]['data']
         
         self.metrics['cache_misses'] += 1
@@ -108,13 +115,13 @@ class OptimizedDataFetcher:
             self._rate_limit()
             
             # Get ticker object
-            stock = yf.Ticker(ticker)
+            stock = yf.Ticker(ticker, session=YF_SESSION)
             
             # Get minute data with error handling
             data = stock.history(period=period, interval=interval, prepost=False)
             
             if data.empty:
-                logger.warning(f"❌ No data available for {ticker}")
+                logger.warning("❌ No data available for %s", ticker)
                 return pd.DataFrame()
             
             # Clean and validate data
@@ -138,12 +145,12 @@ class OptimizedDataFetcher:
                 / self.metrics['requests_made']
             )
             
-            logger.info(f"✅ Fetched {len(data)} minutes of data for {ticker} in {response_time:.2f}s")
+            logger.info("✅ Fetched %s minutes of data for %s in %.2fs", len(data), ticker, response_time)
             return data
             
         except Exception as e:
             self.metrics['errors'] += 1
-            logger.error(f"❌ Error fetching data for {ticker}: {e}")
+            logger.error("❌ Error fetching data for %s: %s", ticker, e)
             return pd.DataFrame()
     
     def get_real_time_price(self, ticker: str) -> float:
@@ -169,7 +176,7 @@ class OptimizedDataFetcher:
         try:
             self._rate_limit()
             
-            stock = yf.Ticker(ticker)
+            stock = yf.Ticker(ticker, session=YF_SESSION)
             info = stock.info
             
             price = info.get('regularMarketPrice', 0)
@@ -185,48 +192,44 @@ class OptimizedDataFetcher:
                 self.metrics['requests_made'] += 1
                 return price
             else:
-                logger.warning(f"❌ Invalid price for {ticker}: {price}")
+                logger.warning("❌ Invalid price for %s: %s", ticker, price)
                 return 0
                 
         except Exception as e:
             self.metrics['errors'] += 1
-            logger.error(f"❌ Error getting real-time price for {ticker}: {e}")
+            logger.error("❌ Error getting real-time price for %s: %s", ticker, e)
             return 0
     
-    def get_market_data_batch(self, tickers: List[str], period: str = "1d") -> Dict[str, pd.DataFrame]:
+    def get_market_data_batch(self, tickers: List[str], period: str = "1d",
+                              timeout: float = 15.0) -> Dict[str, pd.DataFrame]:
         """
         Get optimized market data for multiple tickers
         
         Args:
             tickers (list): List of ticker symbols
             period (str): Time period
+            timeout (float): Seconds to wait for a single ticker
         
         Returns:
             dict: Dictionary with ticker as key and data as value
         """
-        data_dict = {}
+        # Fan the downloads out on the fetcher's pool; yfinance blocks, so threads
+        # give the concurrency without building an event loop per call
+        futures = [self.executor.submit(self.get_minute_data, ticker, period) for ticker in tickers]
         
-        # Use threading for parallel requests
-        threads = []
         results = {}
-        
-        def fetch_ticker_data(ticker):
+        for ticker, future in zip(tickers, futures):
             try:
-                data = self.get_minute_data(ticker, period)
-                if not data.empty:
-                    results[ticker] = data
+                data = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.error("❌ Timed out fetching %s after %ss", ticker, timeout)
+                continue
             except Exception as e:
-                logger.error(f"❌ Error fetching {ticker}: {e}")
-        
-        # Create threads for parallel fetching
-        for ticker in tickers:
-            thread = threading.Thread(target=fetch_ticker_data, args=(ticker,))
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+                logger.error("❌ Error fetching %s: %s", ticker, e)
+                continue
+            if not data.empty:
+                results[ticker] = data
         
         return results
     
@@ -281,7 +284,7 @@ class OptimizedDataFetcher:
             )
             
         except Exception as e:
-            logger.error(f"❌ Error getting comprehensive data for {ticker}: {e}")
+            logger.error("❌ Error getting comprehensive data for %s: %s", ticker, e)
             return None
     
     def _clean_data(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -365,7 +368,7 @@ class OptimizedDataFetcher:
             }
             
         except Exception as e:
-            logger.error(f"❌ Error getting market status: {e}")
+            logger.error("❌ Error getting market status: %s", e)
             return {'is_open': False, 'current_time': datetime.now()}
     
     def get_performance_metrics(self) -> Dict:
@@ -397,7 +400,7 @@ class OptimizedDataFetcher:
                 for i in range(entries_to_remove):
                     del self.cache[sorted_cache[i][0]]
                 
-                logger.info(f"🗑️ Removed {entries_to_remove} old cache entries")
+                logger.info("🗑️ Removed %s old cache entries", entries_to_remove)
 
 # Global instance for backward compatibility
 data_fetcher = OptimizedDataFetcher()
@@ -9,8 +9,140 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import warnings
+from utils.jit import njit, NUMBA_AVAILABLE
 warnings.filterwarnings('ignore')
 
+def _tail_window(values: np.ndarray, window: int) -> np.ndarray:
+    """Last `window` values, or a single NaN when there are fewer (matching rolling().iloc[-1])"""
+    if len(values) < window:
+        return np.array([np.nan])
+    return values[-window:]
+
+def _mean_std(window: np.ndarray) -> Tuple[float, float]:
+    """Mean and sample std (ddof=1) of window from one sum / sum-of-squares pass"""
+    n = len(window)
+    # Deviations from the first sample keep the sum of squares from cancelling
+    deviations = window - window[0]
+    total = deviations.sum()
+    mean = window[0] + total / n
+    if n < 2:
+        return mean, np.nan
+    variance = (deviations @ deviations - total * total / n) / (n - 1)
+    return mean, np.sqrt(max(variance, 0.0))
+
+@njit(cache=True)
+def _volume_flow_kernel(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                        momentum_period: int, mfi_period: int) -> Tuple[float, float, float, float]:
+    """Latest OBV, OBV momentum, VPT and MFI from a single pass over the bars"""
+    n = len(close)
+    obv = volume[0]
+    obv_lagged = obv if n - 1 - momentum_period == 0 else np.nan
+    vpt = 0.0
+    positive_flow = 0.0
+    negative_flow = 0.0
+    prev_typical = (high[0] + low[0] + close[0]) / 3.0
+    
+    for i in range(1, n):
+        # On-Balance Volume
+        if close[i] > close[i - 1]:
+            obv += volume[i]
+        elif close[i] < close[i - 1]:
+            obv -= volume[i]
+        if i == n - 1 - momentum_period:
+            obv_lagged = obv
+        
+        # Volume Price Trend
+        change = close[i] / close[i - 1] - 1.0
+        if not np.isnan(change):
+            vpt += change * volume[i]
+        
+        # Money flow over the last mfi_period bars
+        typical = (high[i] + low[i] + close[i]) / 3.0
+        if i >= n - mfi_period:
+            if typical > prev_typical:
+                positive_flow += typical * volume[i]
+            elif typical < prev_typical:
+                negative_flow += typical * volume[i]
+        prev_typical = typical
+    
+    obv_momentum = obv - obv_lagged if n > momentum_period else 0.0
+    
+    if n < mfi_period:
+        mfi = np.nan
+    elif negative_flow > 0:
+        mfi = 100.0 - 100.0 / (1.0 + positive_flow / negative_flow)
+    elif positive_flow > 0:
+        mfi = 100.0
+    else:
+        mfi = np.nan
+    
+    return obv, obv_momentum, vpt, mfi
+
+@njit(cache=True)
+def _rsi_kernel(close: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's RSI per bar; NaN until `period` price changes have been seen"""
+    n = len(close)
+    rsi = np.full(n, np.nan)
+    alpha = 1.0 / period
+    avg_gain = 0.0
+    avg_loss = 0.0
+    count = 0
+    
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if np.isnan(delta):
+            continue
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        
+        # Wilder's RMA, seeded with the first change
+        if count == 0:
+            avg_gain = gain
+            avg_loss = loss
+        else:
+            avg_gain = (1.0 - alpha) * avg_gain + alpha * gain
+            avg_loss = (1.0 - alpha) * avg_loss + alpha * loss
+        count += 1
+        
+        if count >= period:
+            if avg_loss > 0:
+                rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            elif avg_gain > 0:
+                rsi[i] = 100.0
+    
+    return rsi
+
+@njit(cache=True)
+def _psar_kernel(high: np.ndarray, low: np.ndarray, acceleration: float, maximum: float) -> float:
+    """Latest Parabolic SAR value"""
+    psar = 0.0
+    af = acceleration
+    ep = low[0]
+    long = True
+    
+    for i in range(1, len(high)):
+        psar = psar + af * (ep - psar)
+        if long:
+            if low[i] < psar:
+                long = False
+                psar = ep
+                ep = high[i]
+                af = acceleration
+            elif high[i] > ep:
+                ep = high[i]
+                af = min(af + acceleration, maximum)
+        else:
+            if high[i] > psar:
+                long = True
+                psar = ep
+                ep = low[i]
+                af = acceleration
+            elif low[i] < ep:
+                ep = low[i]
+                af = min(af + acceleration, maximum)
+    
+    return psar
+
 @dataclass
 class IndicatorResult:
     """Structured indicator result"""
@@ -69,9 +201,9 @@ class OptimizedIndicators:
         """Calculate price-based indicators"""
         indicators = {}
         
-        # Moving averages
-        indicators['sma_20'] = data['Close'].rolling(window=20).mean().iloc[-1]
-        indicators['sma_50'] = data['Close'].rolling(window=50).mean().iloc[-1]
+        # Moving averages; SMA 20 is the Bollinger middle band, computed below
+        close = data['Close'].to_numpy(dtype=np.float64)
+        indicators['sma_50'] = _tail_window(close, 50).mean()
         indicators['ema_12'] = data['Close'].ewm(span=12).mean().iloc[-1]
         indicators['ema_26'] = data['Close'].ewm(span=26).mean().iloc[-1]
         
@@ -88,6 +220,7 @@ class OptimizedIndicators:
         # Bollinger Bands
         bb_data = self._calculate_bollinger_bands(data['Close'])
         indicators.update(bb_data)
+        indicators['sma_20'] = bb_data['bb_middle']
         
         # VWAP
         indicators['vwap'] = self._calculate_vwap(data)
@@ -123,18 +256,11 @@ class OptimizedIndicators:
         indicators = {}
         
         # Volume SMA and ratio
-        indicators['volume_sma'] = data['Volume'].rolling(window=20).mean().iloc[-1]
+        indicators['volume_sma'] = _tail_window(data['Volume'].to_numpy(dtype=np.float64), 20).mean()
         indicators['volume_ratio'] = data['Volume'].iloc[-1] / indicators['volume_sma'] if indicators['volume_sma'] > 0 else 1
         
-        # OBV (On-Balance Volume)
-        indicators['obv'] = self._calculate_obv(data)
-        indicators['obv_momentum'] = self._calculate_obv_momentum(data)
-        
-        # Volume Price Trend
-        indicators['vpt'] = self._calculate_vpt(data)
-        
-        # Money Flow Index
-        indicators['mfi'] = self._calculate_mfi(data)
+        # OBV (On-Balance Volume), Volume Price Trend and Money Flow Index in one pass
+        indicators.update(self._calculate_volume_flow(data))
         
         return indicators
     
@@ -197,28 +323,39 @@ class OptimizedIndicators:
         
         return indicators
     
+    def _rsi_series(self, prices: pd.Series, period: int = 14) -> np.ndarray:
+        """
+        Wilder's RSI for every bar in one pass (compiled kernel when numba is installed)
+        
+        Gains and losses are smoothed with Wilder's RMA (an EMA with alpha=1/period).
+        Bars before the first full period are NaN.
+        """
+        close = prices.to_numpy(dtype=np.float64)
+        if NUMBA_AVAILABLE:
+            return _rsi_kernel(close, period)
+        
+        # Without numba the kernel is a Python loop; pandas' EWM is the faster path
+        delta = np.diff(close, prepend=np.nan)
+        gain = pd.Series(np.maximum(delta, 0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean().to_numpy()
+        loss = pd.Series(-np.minimum(delta, 0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean().to_numpy()
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 100 - 100 / (1 + gain / loss)
+    
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
         """Calculate RSI with optimization"""
         if len(prices) < period:
             return 50.0
         
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi.iloc[-1] if not rsi.empty and not np.isnan(rsi.iloc[-1]) else 50.0
+        rsi = self._rsi_series(prices, period)[-1]
+        return rsi if not np.isnan(rsi) else 50.0
     
     def _calculate_rsi_momentum(self, prices: pd.Series, period: int = 14) -> float:
         """Calculate RSI momentum"""
-        rsi = pd.Series([self._calculate_rsi(prices.iloc[:i+1], period) 
-                        for i in range(period, len(prices))], 
-                       index=prices.index[period:])
+        rsi = np.nan_to_num(self._rsi_series(prices, period)[period:], nan=50.0)
         
         if len(rsi) > 1:
-            return rsi.iloc[-1] - rsi.iloc[-2]
+            return rsi[-1] - rsi[-2]
         return 0.0
     
     def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict:
@@ -238,16 +375,19 @@ class OptimizedIndicators:
     
     def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: float = 2.0) -> Dict:
         """Calculate Bollinger Bands"""
-        middle = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
+        if prices.empty:
+            return {'bb_upper': 0, 'bb_middle': 0, 'bb_lower': 0, 'bb_position': 0.5}
+        
+        # Only the latest band is reported, so reduce the last window directly
+        middle, std = _mean_std(_tail_window(prices.to_numpy(dtype=np.float64), period))
         upper = middle + (std * std_dev)
         lower = middle - (std * std_dev)
         
         return {
-            'bb_upper': upper.iloc[-1] if not upper.empty else 0,
-            'bb_middle': middle.iloc[-1] if not middle.empty else 0,
-            'bb_lower': lower.iloc[-1] if not lower.empty else 0,
-            'bb_position': (prices.iloc[-1] - lower.iloc[-1]) / (upper.iloc[-1] - lower.iloc[-1]) if len(upper) > 0 and len(lower) > 0 and upper.iloc[-1] != lower.iloc[-1] else 0.5
+            'bb_upper': upper,
+            'bb_middle': middle,
+            'bb_lower': lower,
+            'bb_position': (prices.iloc[-1] - lower) / (upper - lower) if upper != lower else 0.5
         }
     
     def _calculate_vwap(self, data: pd.DataFrame) -> float:
@@ -258,9 +398,8 @@ class OptimizedIndicators:
     
     def _calculate_stochastic_rsi(self, prices: pd.Series, period: int = 14, k_period: int = 3, d_period: int = 3) -> Dict:
         """Calculate Stochastic RSI"""
-        rsi = pd.Series([self._calculate_rsi(prices.iloc[:i+1], period) 
-                        for i in range(period, len(prices))], 
-                       index=prices.index[period:])
+        rsi = pd.Series(np.nan_to_num(self._rsi_series(prices, period)[period:], nan=50.0),
+                        index=prices.index[period:])
         
         if len(rsi) < k_period:
             return {'stoch_rsi_k': 50, 'stoch_rsi_d': 50}
@@ -286,53 +425,36 @@ class OptimizedIndicators:
     
     def _calculate_cci(self, data: pd.DataFrame, period: int = 20) -> float:
         """Calculate CCI (Commodity Channel Index)"""
-        typical_price = (data['High'] + data['Low'] + data['Close']) / 3
-        sma_tp = typical_price.rolling(window=period).mean()
-        mad = typical_price.rolling(window=period).apply(lambda x: np.mean(np.abs(x - x.mean())))
-        
-        cci = (typical_price - sma_tp) / (0.015 * mad)
-        return cci.iloc[-1] if not cci.empty else 0
-    
-    def _calculate_obv(self, data: pd.DataFrame) -> float:
-        """Calculate OBV (On-Balance Volume)"""
-        obv = pd.Series(index=data.index, dtype=float)
-        obv.iloc[0] = data['Volume'].iloc[0]
-        
-        for i in range(1, len(data)):
-            if data['Close'].iloc[i] > data['Close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] + data['Volume'].iloc[i]
-            elif data['Close'].iloc[i] < data['Close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] - data['Volume'].iloc[i]
-            else:
-                obv.iloc[i] = obv.iloc[i-1]
-        
-        return obv.iloc[-1] if not obv.empty else 0
-    
-    def _calculate_obv_momentum(self, data: pd.DataFrame, period: int = 10) -> float:
-        """Calculate OBV momentum"""
-        obv = self._calculate_obv(data)
-        obv_series = pd.Series([self._calculate_obv(data.iloc[:i+1]) for i in range(len(data))])
-        
-        if len(obv_series) > period:
-            return obv_series.iloc[-1] - obv_series.iloc[-period-1]
-        return 0
-    
-    def _calculate_vpt(self, data: pd.DataFrame) -> float:
-        """Calculate VPT (Volume Price Trend)"""
-        price_change = data['Close'].pct_change()
-        vpt = (price_change * data['Volume']).cumsum()
-        return vpt.iloc[-1] if not vpt.empty else 0
-    
-    def _calculate_mfi(self, data: pd.DataFrame, period: int = 14) -> float:
-        """Calculate MFI (Money Flow Index)"""
-        typical_price = (data['High'] + data['Low'] + data['Close']) / 3
-        money_flow = typical_price * data['Volume']
-        
-        positive_flow = money_flow.where(typical_price > typical_price.shift(1), 0).rolling(window=period).sum()
-        negative_flow = money_flow.where(typical_price < typical_price.shift(1), 0).rolling(window=period).sum()
-        
-        mfi = 100 - (100 / (1 + positive_flow / negative_flow))
-        return mfi.iloc[-1] if not mfi.empty else 50
+        if data.empty:
+            return 0
+        
+        # Only the latest value is reported: reduce the last window instead of
+        # calling a Python mean-deviation function for every rolling window
+        typical_price = _tail_window(
+            (data['High'].to_numpy(dtype=np.float64) + data['Low'].to_numpy(dtype=np.float64)
+             + data['Close'].to_numpy(dtype=np.float64)) / 3,
+            period
+        )
+        sma_tp = typical_price.mean()
+        mad = np.abs(typical_price - sma_tp).mean()
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (typical_price[-1] - sma_tp) / (0.015 * mad)
+    
+    def _calculate_volume_flow(self, data: pd.DataFrame, momentum_period: int = 10, mfi_period: int = 14) -> Dict:
+        """Calculate OBV, OBV momentum, VPT and MFI"""
+        if data.empty:
+            return {'obv': 0, 'obv_momentum': 0, 'vpt': 0, 'mfi': 50}
+        
+        obv, obv_momentum, vpt, mfi = _volume_flow_kernel(
+            data['High'].to_numpy(dtype=np.float64),
+            data['Low'].to_numpy(dtype=np.float64),
+            data['Close'].to_numpy(dtype=np.float64),
+            data['Volume'].to_numpy(dtype=np.float64),
+            momentum_period,
+            mfi_period
+        )
+        return {'obv': obv, 'obv_momentum': obv_momentum, 'vpt': vpt, 'mfi': mfi}
     
     def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
         """Calculate ATR (Average True Range)"""
@@ -351,9 +473,11 @@ class OptimizedIndicators:
     
     def _calculate_historical_volatility(self, prices: pd.Series, period: int = 20) -> float:
         """Calculate historical volatility"""
-        returns = prices.pct_change().dropna()
-        if len(returns) >= period:
-            return returns.rolling(window=period).std().iloc[-1] * np.sqrt(252)  # Annualized
+        # Only the latest window of returns is needed
+        close = prices.to_numpy(dtype=np.float64)[-(period + 1):]
+        if len(close) > period:
+            returns = close[1:] / close[:-1] - 1
+            return returns.std(ddof=1) * np.sqrt(252)  # Annualized
         return 0
     
     def _calculate_keltner_channels(self, data: pd.DataFrame, period: int = 20, multiplier: float = 2.0) -> Dict:
@@ -406,40 +530,8 @@ class OptimizedIndicators:
     
     def _calculate_psar(self, data: pd.DataFrame, acceleration: float = 0.02, maximum: float = 0.2) -> float:
         """Calculate Parabolic SAR"""
-        high = data['High'].values
-        low = data['Low'].values
-        close = data['Close'].values
-        
-        psar = np.zeros(len(data))
-        af = acceleration
-        ep = low[0]
-        long = True
-        
-        for i in range(1, len(data)):
-            if long:
-                psar[i] = psar[i-1] + af * (ep - psar[i-1])
-                if low[i] < psar[i]:
-                    long = False
-                    psar[i] = ep
-                    ep = high[i]
-                    af = acceleration
-                else:
-                    if high[i] > ep:
-                        ep = high[i]
-                        af = min(af + acceleration, maximum)
-            else:
-                psar[i] = psar[i-1] + af * (ep - psar[i-1])
-                if high[i] > psar[i]:
-                    long = True
-                    psar[i] = ep
-                    ep = low[i]
-                    af = acceleration
-                else:
-                    if low[i] < ep:
-                        ep = low[i]
-                        af = min(af + acceleration, maximum)
-        
-        return psar[-1]
+        return _psar_kernel(data['High'].to_numpy(dtype=np.float64), data['Low'].to_numpy(dtype=np.float64),
+                            acceleration, maximum)
     
     def _calculate_ichimoku(self, data: pd.DataFrame) -> Dict:
         """Calculate Ichimoku Cloud components"""
@@ -535,14 +627,9 @@ class OptimizedIndicators:
         if len(data) < 30:
             return 'none'
         
-        # Calculate RSI for last 30 periods
-        rsi_values = []
-        price_values = []
-        
-        for i in range(20, len(data)):
-            rsi = self._calculate_rsi(data['Close'].iloc[:i+1])
-            rsi_values.append(rsi)
-            price_values.append(data['Close'].iloc[i])
+        # RSI and price from bar 20 onwards
+        rsi_values = np.nan_to_num(self._rsi_series(data['Close'])[20:], nan=50.0)
+        price_values = data['Close'].to_numpy()[20:]
         
         if len(rsi_values) < 10:
             return 'none'
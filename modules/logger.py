@@ -4,9 +4,72 @@ Logger Module
 Handles logging of trades and events
 """
 
-import json
+import orjson
 from datetime import datetime
 import os
+import threading
+from collections import deque
+from itertools import islice
+
+from utils.atomic_file import write_atomic
+
+TRADE_LOG_FILE = "trading_log.json"
+TRADE_BUFFER_SIZE = 1000
+
+# Most recent trades kept in memory; reloaded only when the log file changes on disk
+_trade_buffer = deque(maxlen=TRADE_BUFFER_SIZE)
+_trade_log_signature = None
+_trade_buffer_lock = threading.Lock()
+
+# Parsed log files keyed by path: (file signature, entries)
+_log_cache = {}
+_log_write_lock = threading.Lock()
+
+# numpy scalars come through in indicator dicts; anything else unknown (e.g. Timestamp) is stringified
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
+def _read_log(path):
+    """Entries of a JSON log file, or [] if it does not exist"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _write_json(path, data):
+    """Replace path with data as indented JSON"""
+    write_atomic(path, orjson.dumps(data, default=str, option=_JSON_OPTIONS))
+
+def _file_signature(path):
+    """(mtime_ns, size) of path, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _read_log_cached(path):
+    """Like _read_log, but only re-parses the file after it changes on disk"""
+    signature = _file_signature(path)
+    cached = _log_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    logs = _read_log(path) if signature is not None else []
+    _log_cache[path] = (signature, logs)
+    return logs
+
+def _append_log(path, entry):
+    """Append entry to the JSON log at path and return the updated entries
+    
+    Extends the cached parse of the file rather than re-reading it, and records
+    the rewritten file's signature so the next append or read reuses it. The
+    cache is only replaced once the write has succeeded.
+    """
+    with _log_write_lock:
+        logs = _read_log_cached(path) + [entry]
+        _write_json(path, logs)
+        _log_cache[path] = (_file_signature(path), logs)
+        return logs
 
 def log_trade(ticker, contract, action, price, trade_size=None, pnl=None):
     """
@@ -31,21 +94,12 @@ def log_trade(ticker, contract, action, price, trade_size=None, pnl=None):
     }
     
     # Save to log file
-    log_file = "trading_log.json"
+    log_file = TRADE_LOG_FILE
     
     try:
-        # Load existing logs
-        logs = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
-        
-        # Add new log entry
-        logs.append(log_entry)
-        
-        # Save back to file
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
+        with _trade_buffer_lock:
+            logs = _append_log(log_file, log_entry)
+            _refresh_trade_buffer(logs)
         
         print(f"📝 Trade logged: {action} {contract} at ${price:.2f}")
         
@@ -74,18 +128,7 @@ def log_signal(ticker, signal_type, strength, indicators):
     log_file = "signal_log.json"
     
     try:
-        # Load existing logs
-        logs = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
-        
-        # Add new log entry
-        logs.append(log_entry)
-        
-        # Save back to file
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
+        _append_log(log_file, log_entry)
         
         print(f"📊 Signal logged: {signal_type} for {ticker} (strength: {strength})")
         
@@ -112,50 +155,52 @@ def log_error(error_type, message, details=None):
     log_file = "error_log.json"
     
     try:
-        # Load existing logs
-        logs = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
-        
-        # Add new log entry
-        logs.append(log_entry)
-        
-        # Save back to file
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
+        _append_log(log_file, log_entry)
         
         print(f"❌ Error logged: {error_type} - {message}")
         
     except Exception as e:
         print(f"❌ Error logging error: {e}")
 
+def _refresh_trade_buffer(logs):
+    """Replace the in-memory trade buffer with the tail of logs (caller holds the lock)"""
+    global _trade_log_signature
+    _trade_buffer.clear()
+    _trade_buffer.extend(logs[-TRADE_BUFFER_SIZE:])
+    _trade_log_signature = _file_signature(TRADE_LOG_FILE)
+
 def get_trade_history(limit=50):
     """
     Get recent trade history
     
     Args:
-        limit (int): Number of trades to return
+        limit (int): Number of trades to return (at most TRADE_BUFFER_SIZE)
     
     Returns:
         list: List of recent trades
     """
-    log_file = "trading_log.json"
-    
     try:
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
+        with _trade_buffer_lock:
+            # Only re-parse the log when another writer has changed it
+            signature = _file_signature(TRADE_LOG_FILE)
+            if signature != _trade_log_signature:
+                _refresh_trade_buffer(_read_log(TRADE_LOG_FILE))
             
             # Return most recent trades
-            return logs[-limit:] if len(logs) > limit else logs
-        else:
-            return []
+            return list(islice(_trade_buffer, max(len(_trade_buffer) - limit, 0), None))
             
     except Exception as e:
         print(f"❌ Error reading trade history: {e}")
         return []
 
+def get_trade_log_signature():
+    """(mtime_ns, size) of the trade log behind the last get_trade_history result
+    
+    Changes whenever the log file is rewritten, so it can key caches built from
+    the trade history without fingerprinting every trade.
+    """
+    return _trade_log_signature
+
 def get_signal_history(limit=50):
     """
     Get recent signal history
@@ -169,14 +214,10 @@ def get_signal_history(limit=50):
     log_file = "signal_log.json"
     
     try:
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
-            
-            # Return most recent signals
-            return logs[-limit:] if len(logs) > limit else logs
-        else:
-            return []
+        logs = _read_log_cached(log_file)
+        
+        # Return most recent signals (always a copy; the cached list is shared)
+        return logs[-limit:]
             
     except Exception as e:
         print(f"❌ Error reading signal history: {e}")
@@ -208,8 +249,7 @@ def export_logs(filename="trading_logs_export.json"):
             'export_timestamp': datetime.now().isoformat()
         }
         
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        _write_json(filename, export_data)
         
         print(f"📤 Logs exported to {filename}")
         
@@ -17,13 +17,19 @@ def check_exit_conditions(open_trades, profit_target=3, stop_loss=3):
         profit_target (float): Profit target percentage
         stop_loss (float): Stop loss percentage
     """
+    # One clock read and one price lookup per ticker for the whole pass
+    current_time = datetime.now()
+    prices = {}
+    
     for trade in open_trades:
         if trade['status'] != 'open':
             continue
         
         # Get current price
         ticker = trade['symbol'].split('_')[0]
-        current_price = get_real_time_price(ticker)
+        if ticker not in prices:
+            prices[ticker] = get_real_time_price(ticker)
+        current_price = prices[ticker]
         
         if current_price == 0:
             continue
@@ -44,7 +50,6 @@ def check_exit_conditions(open_trades, profit_target=3, stop_loss=3):
         
         # Check time-based exit (5 minutes max)
         entry_time = datetime.fromisoformat(trade['entry_time'])
-        current_time = datetime.now()
         time_in_trade = current_time - entry_time
         
         if time_in_trade >= timedelta(minutes=5):
@@ -5,9 +5,17 @@ Simple Schwab Authentication Module
 
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 from datetime import datetime
 from config.env_config import get_config
+from config.schwab_config import TOKEN_TIMEOUT
+from utils.atomic_file import write_atomic
+
+# Pooled HTTP session so token requests reuse the TLS connection to Schwab
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+_session.headers.update({'Accept': 'application/json'})
 
 class SchwabAuth:
     def __init__(self):
@@ -158,10 +166,10 @@ class SchwabAuth:
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
             
-            response = requests.post(url, data=data, headers=headers)
+            response = _session.post(url, data=data, headers=headers, timeout=TOKEN_TIMEOUT)
             
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = orjson.loads(response.content)
                 self.save_token_data(token_data)
                 return True
             else:
@@ -192,8 +200,8 @@ class SchwabAuth:
     def get_auth_status(self):
         """Get current authentication status"""
         try:
-            with open(self.auth_file, 'r') as f:
-                return json.load(f)
+            with open(self.auth_file, 'rb') as f:
+                return orjson.loads(f.read())
         except FileNotFoundError:
             return {}
         except Exception:
@@ -202,16 +210,14 @@ class SchwabAuth:
     def save_auth_data(self, auth_data):
         """Save authentication data"""
         try:
-            with open(self.auth_file, 'w') as f:
-                json.dump(auth_data, f, indent=2)
+            write_atomic(self.auth_file, orjson.dumps(auth_data, option=orjson.OPT_INDENT_2))
         except Exception as e:
             st.error(f"Error saving auth data: {e}")
     
     def save_token_data(self, token_data):
         """Save token data"""
         try:
-            with open('schwab_tokens.json', 'w') as f:
-                json.dump(token_data, f, indent=2)
+            write_atomic('schwab_tokens.json', orjson.dumps(token_data, option=orjson.OPT_INDENT_2))
         except Exception as e:
             st.error(f"Error saving token data: {e}")
     
@@ -239,4 +245,9 @@ class SchwabAuth:
             return True
             
         except Exception:
-            return False 
\ No newline at end of file
+            return False
+
+@st.cache_resource(show_spinner=False)
+def get_schwab_auth():
+    """Get the shared SchwabAuth instance, created once per server process"""
+    return SchwabAuth()
@@ -4,7 +4,10 @@ Schwab Data Fetcher Module
 Provides real-time market data and options data from Schwab API
 """
 
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+import orjson
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -15,25 +18,41 @@ from config.schwab_config import schwab_config, SchwabEndpoints
 
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = (3, 10)  # (connect, read) seconds
+
+# Period -> (periodType, period, frequencyType, frequency) for the price history endpoint
+_HISTORY_PERIODS = {
+    "1d": ("day", 1, "minute", 1),
+    "5d": ("day", 5, "minute", 5),
+    "1mo": ("month", 1, "daily", 1),
+    "3mo": ("month", 3, "daily", 1),
+    "6mo": ("month", 6, "daily", 1),
+    "1y": ("year", 1, "daily", 1),
+}
+
 class SchwabDataFetcher:
     """Real-time data fetcher using Schwab API"""
     
     def __init__(self):
+        # Keep-alive connection pool shared by every request
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
         self.cache = {}
         self.cache_ttl = 30  # 30 seconds cache for real-time data
         self.last_request_time = 0
         self.rate_limit_delay = 0.1  # 100ms between requests
+        self._rate_lock = threading.Lock()
         
     def _rate_limit(self):
-        """Implement rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        
-        self.last_request_time = time.time()
+        """Implement rate limiting (safe to call from worker threads)"""
+        with self._rate_lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_request_time
+            
+            if time_since_last < self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay - time_since_last)
+            
+            self.last_request_time = time.time()
     
     def _make_request(self, url: str, method: str = "GET", data: Dict = None) -> Dict:
         """Make authenticated request to Schwab API"""
@@ -43,14 +62,14 @@ class SchwabDataFetcher:
             headers = schwab_config.get_headers()
             
             if method == "GET":
-                response = self.session.get(url, headers=headers)
+                response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
             elif method == "POST":
-                response = self.session.post(url, headers=headers, json=data)
+                response = self.session.post(url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             elif response.status_code == 401:
                 # Token expired, try to refresh
                 logger.warning("Token expired, attempting refresh...")
@@ -59,12 +78,12 @@ class SchwabDataFetcher:
                 
                 # Retry request
                 if method == "GET":
-                    response = self.session.get(url, headers=headers)
+                    response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
                 else:
-                    response = self.session.post(url, headers=headers, json=data)
+                    response = self.session.post(url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
                 
                 if response.status_code == 200:
-                    return response.json()
+                    return orjson.loads(response.content)
                 else:
                     raise Exception(f"API request failed after token refresh: {response.status_code}")
             else:
@@ -97,6 +116,46 @@ class SchwabDataFetcher:
             logger.error(f"Error getting quote for {symbol}: {e}")
             return {}
     
+    def get_real_time_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Get real-time quotes for several symbols with a single request
+        
+        Symbols still fresh in the cache are served from it; the rest are
+        fetched together through the comma-separated quotes endpoint.
+        """
+        results = {}
+        missing = []
+        now = time.time()
+        
+        for symbol in symbols:
+            cache_key = f"quote_{symbol}"
+            if cache_key in self.cache:
+                cache_time, cache_data = self.cache[cache_key]
+                if now - cache_time < self.cache_ttl:
+                    results[symbol] = cache_data
+                    continue
+            missing.append(symbol)
+        
+        if not missing:
+            return results
+        
+        try:
+            url = SchwabEndpoints.get_quotes(missing)
+            data = self._make_request(url)
+            
+            # Cache each symbol in the same shape a single-symbol request returns
+            fetched_at = time.time()
+            for symbol in missing:
+                if symbol in data:
+                    quote = {symbol: data[symbol]}
+                    self.cache[f"quote_{symbol}"] = (fetched_at, quote)
+                    results[symbol] = quote
+            
+        except Exception as e:
+            logger.error(f"Error getting quotes for {', '.join(missing)}: {e}")
+        
+        return results
+    
     def get_minute_data(self, symbol: str, period: str = "1d") -> pd.DataFrame:
         """
         Get minute-level data for a symbol
@@ -240,13 +299,52 @@ class SchwabDataFetcher:
             return []
     
     def get_historical_data(self, symbol: str, period: str = "1d") -> pd.DataFrame:
-        """
-        Get historical data for backtesting
-        Note: This would need to be implemented based on Schwab's historical data API
-        """
-        # Placeholder for historical data implementation
-        logger.warning("Historical data not yet implemented for Schwab API")
-        return pd.DataFrame()
+        """Get historical OHLCV candles for backtesting (minute bars up to 5d, daily beyond)"""
+        cache_key = f"history_{symbol}_{period}"
+        
+        # Check cache first
+        if cache_key in self.cache:
+            cache_time, cache_data = self.cache[cache_key]
+            if time.time() - cache_time < self.cache_ttl:
+                return cache_data
+        
+        try:
+            url = SchwabEndpoints.get_price_history(symbol, *_HISTORY_PERIODS.get(period, _HISTORY_PERIODS["1d"]))
+            df = self._parse_historical_data(self._make_request(url))
+            
+            # Cache the result
+            self.cache[cache_key] = (time.time(), df)
+            
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error getting historical data for {symbol}: {e}")
+            return pd.DataFrame()
+    
+    @staticmethod
+    def _parse_historical_data(data: Dict) -> pd.DataFrame:
+        """Price history payload -> OHLCV DataFrame, filled column-wise in one pass"""
+        candles = data.get("candles") or []
+        n = len(candles)
+        
+        times = np.empty(n, dtype=np.int64)
+        opens = np.empty(n)
+        highs = np.empty(n)
+        lows = np.empty(n)
+        closes = np.empty(n)
+        volumes = np.empty(n, dtype=np.int64)
+        for i, candle in enumerate(candles):
+            times[i] = candle["datetime"]
+            opens[i] = candle["open"]
+            highs[i] = candle["high"]
+            lows[i] = candle["low"]
+            closes[i] = candle["close"]
+            volumes[i] = candle["volume"]
+        
+        return pd.DataFrame(
+            {"Open": opens, "High": highs, "Low": lows, "Close": closes, "Volume": volumes},
+            index=pd.DatetimeIndex(pd.to_datetime(times, unit="ms"), name="Date")
+        )
 
 # Global instance
 schwab_data_fetcher = SchwabDataFetcher()
@@ -256,6 +354,10 @@ def get_schwab_quote(symbol: str) -> Dict:
     """Get real-time quote from Schwab"""
     return schwab_data_fetcher.get_real_time_quote(symbol)
 
+def get_schwab_quotes(symbols: List[str]) -> Dict[str, Dict]:
+    """Get real-time quotes for several symbols from Schwab"""
+    return schwab_data_fetcher.get_real_time_quotes(symbols)
+
 def get_schwab_minute_data(symbol: str, period: str = "1d") -> pd.DataFrame:
     """Get minute data from Schwab"""
     return schwab_data_fetcher.get_minute_data(symbol, period)
@@ -104,4 +104,9 @@ class SecureAuth:
                 self.logout()
                 st.rerun()
         
-        return True 
\ No newline at end of file
+        return True 
+
+@st.cache_resource(show_spinner=False)
+def get_secure_auth():
+    """Get the shared SecureAuth instance, created once per server process"""
+    return SecureAuth()
@@ -9,6 +9,29 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+# Bit position of each signal in a signal mask
+SIGNAL_BITS = {
+    'rsi_signal': 0,
+    'macd_signal': 1,
+    'volume_signal': 2,
+    'momentum_signal': 3,
+    'volatility_signal': 4,
+    'support_resistance_signal': 5
+}
+SIGNAL_COUNT = len(SIGNAL_BITS)
+
+def signal_mask(signals: Dict[str, bool]) -> int:
+    """Pack a check_signals result into an int with one bit per active signal
+    
+    Keys without a bit in SIGNAL_BITS are ignored.
+    """
+    mask = 0
+    for name, active in signals.items():
+        bit = SIGNAL_BITS.get(name)
+        if active and bit is not None:
+            mask |= 1 << bit
+    return mask
+
 @dataclass
 class SignalResult:
     """Structured signal result"""
@@ -155,12 +178,13 @@ class OptimizedSignalEngine:
             'support_resistance_signal': False
         }
     
-    def get_signal_strength(self, indicators: Dict) -> int:
+    def get_signal_strength(self, indicators: Dict, signals: Optional[Dict[str, bool]] = None) -> int:
         """
         Enhanced signal strength calculation (0-100)
         
         Args:
             indicators (dict): Dictionary of technical indicators
+            signals (dict): Precomputed result of check_signals, if available
         
         Returns:
             int: Signal strength (0-100)
@@ -169,10 +193,11 @@ class OptimizedSignalEngine:
             return 0
         
         strength = 0
-        signals = self.check_signals(indicators)
+        if signals is None:
+            signals = self.check_signals(indicators)
         
         # Base strength from signal count
-        signal_count = sum(signals.values())
+        signal_count = signal_mask(signals).bit_count()
         strength += signal_count * 15  # 15 points per signal
         
         # RSI contribution (0-20 points)
@@ -212,23 +237,28 @@ class OptimizedSignalEngine:
         
         return min(strength, 100)
     
-    def should_buy(self, indicators: Dict, min_strength: int = 60) -> bool:
+    def should_buy(self, indicators: Dict, min_strength: int = 60,
+                   signals: Optional[Dict[str, bool]] = None) -> bool:
         """
         Enhanced buy decision with optimized logic
         
         Args:
             indicators (dict): Dictionary of technical indicators
             min_strength (int): Minimum signal strength required
+            signals (dict): Precomputed result of check_signals, if available
         
         Returns:
             bool: True if should buy, False otherwise
         """
-        signals = self.check_signals(indicators)
-        strength = self.get_signal_strength(indicators)
+        if signals is None:
+            signals = self.check_signals(indicators)
+        
+        # Require at least 3 positive signals; most ticks fail here, so skip
+        # the strength scoring unless this passes
+        if signal_mask(signals).bit_count() < 3:
+            return False
         
-        # Require at least 3 positive signals and strength above threshold
-        positive_signals = sum(signals.values())
-        return positive_signals >= 3 and strength >= min_strength
+        return self.get_signal_strength(indicators, signals) >= min_strength
     
     def should_sell(self, indicators: Dict, entry_price: float, 
                    current_price: float, profit_target: float = 3, 
@@ -283,24 +313,29 @@ class OptimizedSignalEngine:
         
         return False
     
-    def get_signal_confidence(self, indicators: Dict) -> float:
+    def get_signal_confidence(self, indicators: Dict, signals: Optional[Dict[str, bool]] = None,
+                              strength: Optional[int] = None) -> float:
         """
         Calculate signal confidence (0.0-1.0)
         
         Args:
             indicators (dict): Dictionary of technical indicators
+            signals (dict): Precomputed result of check_signals, if available
+            strength (int): Precomputed result of get_signal_strength, if available
         
         Returns:
             float: Confidence level (0.0-1.0)
         """
-        strength = self.get_signal_strength(indicators)
-        signals = self.check_signals(indicators)
+        if signals is None:
+            signals = self.check_signals(indicators)
+        if strength is None:
+            strength = self.get_signal_strength(indicators, signals)
         
         # Base confidence from strength
         confidence = strength / 100.0
         
         # Boost confidence based on signal alignment
-        positive_signals = sum(signals.values())
+        positive_signals = signal_mask(signals).bit_count()
         if positive_signals >= 4:
             confidence *= 1.2
         elif positive_signals >= 3:
@@ -7,9 +7,15 @@ Handles trade execution and management
 import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from modules.data_fetcher import get_real_time_price
 
+# Pooled HTTP session so order requests reuse the TLS connection to Schwab
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+ORDER_TIMEOUT = (3, 10)  # (connect, read) seconds; a stalled connection must not hang order placement
+
 # Global variables for trade management
 active_trade = False
 open_trades = []
@@ -146,7 +152,7 @@ def execute_schwab_trade(option_symbol, amount_usd):
     url = f"https://api.schwabapi.com/v1/trading/accounts/{account_id}/orders"
     
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = _session.post(url, headers=headers, json=payload, timeout=ORDER_TIMEOUT)
 
         if response.status_code == 201:
             print(f"✅ Trade placed for {quantity} contracts of {option_symbol}")
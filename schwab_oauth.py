@@ -5,13 +5,15 @@ Complete OAuth2 flow for Schwab API access
 """
 
 import os
-import json
+import orjson
 import webbrowser
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlencode, urlparse, parse_qs
 
 # Import configuration
-from config.schwab_config import get_config, get_auth_url
+from config.schwab_config import get_config, get_auth_url, TOKEN_TIMEOUT
+from utils.atomic_file import write_atomic
 
 # Load configuration
 config = get_config()
@@ -22,6 +24,11 @@ AUTH_URL = config["auth_url"]
 TOKEN_URL = config["token_url"]
 TOKEN_PATH = config["token_path"]
 
+# Pooled HTTP session so token requests reuse the TLS connection to Schwab
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+_session.headers.update({"Accept": "application/json"})
+
 def get_authorization_code():
     """Get authorization code from Schwab OAuth2"""
     auth_url = get_auth_url()
@@ -100,10 +107,10 @@ def request_tokens(auth_code):
     }
     
     try:
-        response = requests.post(TOKEN_URL, data=data, headers=headers)
+        response = _session.post(TOKEN_URL, data=data, headers=headers, timeout=TOKEN_TIMEOUT)
         
         if response.status_code == 200:
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             print("✅ Token exchange successful!")
             return token_data
         else:
@@ -125,8 +132,7 @@ def save_tokens(token_data):
         token_data['client_id'] = SCHWAB_CLIENT_ID
         token_data['redirect_uri'] = SCHWAB_REDIRECT_URI
         
-        with open(TOKEN_PATH, 'w') as f:
-            json.dump(token_data, f, indent=2)
+        write_atomic(TOKEN_PATH, orjson.dumps(token_data, option=orjson.OPT_INDENT_2))
         
         print(f"✅ Tokens saved to {TOKEN_PATH}")
         return True
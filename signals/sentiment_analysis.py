@@ -6,7 +6,6 @@ Sentiment Analysis for Options Scalping Bot
 import pandas as pd
 import numpy as np
 from typing import Dict, Optional
-import requests
 import time
 
 class SentimentAnalyzer:
@@ -36,7 +36,6 @@ class TechnicalIndicators:
             indicators['macd_histogram'] = macd_data['histogram']
             
             # Moving Averages
-            indicators['sma_20'] = self.calculate_sma(data['Close'], 20)
             indicators['sma_50'] = self.calculate_sma(data['Close'], 50)
             indicators['ema_12'] = self.calculate_ema(data['Close'], 12)
             indicators['ema_26'] = self.calculate_ema(data['Close'], 26)
@@ -47,6 +46,7 @@ class TechnicalIndicators:
             indicators['bb_middle'] = bb_data['middle']
             indicators['bb_lower'] = bb_data['lower']
             indicators['bb_width'] = bb_data['width']
+            indicators['sma_20'] = bb_data['middle']
             
             # Volume indicators
             indicators['volume_sma'] = self.calculate_volume_sma(data)
@@ -64,14 +64,47 @@ class TechnicalIndicators:
             print(f"Error calculating indicators: {e}")
             return {}
     
+    def calculate_signal_indicators(self, data: pd.DataFrame) -> Dict:
+        """Calculate only the indicators the trading signal reads
+        
+        A lighter calculate_all_indicators for the per-ticker scan: skips ATR,
+        VWAP, EMAs, SMA 50 and the other values the signal never looks at.
+        """
+        if data is None or data.empty:
+            return {}
+        
+        try:
+            close = data['Close']
+            macd_data = self.calculate_macd(close)
+            bb_data = self.calculate_bollinger_bands(close)
+            
+            return {
+                'current_price': close.iloc[-1],
+                'rsi': self.calculate_rsi(close),
+                'macd': macd_data['macd'],
+                'macd_signal': macd_data['signal'],
+                'bb_upper': bb_data['upper'],
+                'bb_lower': bb_data['lower'],
+                'volume_sma': self.calculate_volume_sma(data)
+            }
+            
+        except Exception as e:
+            print(f"Error calculating indicators: {e}")
+            return {}
+    
+    def calculate_rsi_series(self, prices: pd.Series, period: int = 14) -> pd.Series:
+        """Relative Strength Index at every bar, on the index of prices"""
+        # Wilder's smoothing (EMA with alpha=1/period) of gains and losses
+        delta = np.diff(prices.to_numpy(dtype=np.float64), prepend=np.nan)
+        gain = pd.Series(np.maximum(delta, 0), index=prices.index).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+        loss = pd.Series(-np.minimum(delta, 0), index=prices.index).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+    
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
         """Calculate Relative Strength Index"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = self.calculate_rsi_series(prices, period)
             return rsi.iloc[-1] if not rsi.empty else 50
         except Exception:
             return 50
@@ -98,8 +131,9 @@ class TechnicalIndicators:
     def calculate_sma(self, prices: pd.Series, period: int) -> float:
         """Calculate Simple Moving Average"""
         try:
-            sma = prices.rolling(window=period).mean()
-            return sma.iloc[-1] if not sma.empty else prices.iloc[-1]
+            # Only the latest value is needed: average the last window, not a rolling series
+            window = prices.to_numpy(dtype=np.float64)[-period:]
+            return window.mean() if len(window) == period else np.nan
         except Exception:
             return prices.iloc[-1] if not prices.empty else 0
     
@@ -114,17 +148,23 @@ class TechnicalIndicators:
     def calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: int = 2) -> Dict:
         """Calculate Bollinger Bands"""
         try:
-            sma = prices.rolling(window=period).mean()
-            std = prices.rolling(window=period).std()
+            window = prices.to_numpy(dtype=np.float64)[-period:]
+            if len(window) == 0:
+                raise ValueError("no prices")
+            if len(window) < period:
+                sma = std = np.nan
+            else:
+                sma = window.mean()
+                std = window.std(ddof=1)
             
             upper_band = sma + (std * std_dev)
             lower_band = sma - (std * std_dev)
             
             return {
-                'upper': upper_band.iloc[-1] if not upper_band.empty else prices.iloc[-1],
-                'middle': sma.iloc[-1] if not sma.empty else prices.iloc[-1],
-                'lower': lower_band.iloc[-1] if not lower_band.empty else prices.iloc[-1],
-                'width': (upper_band.iloc[-1] - lower_band.iloc[-1]) / sma.iloc[-1] if not sma.empty else 0
+                'upper': upper_band,
+                'middle': sma,
+                'lower': lower_band,
+                'width': (upper_band - lower_band) / sma
             }
         except Exception:
             current_price = prices.iloc[-1] if not prices.empty else 0
@@ -138,9 +178,10 @@ class TechnicalIndicators:
     def calculate_volume_sma(self, data: pd.DataFrame, period: int = 20) -> float:
         """Calculate Volume Simple Moving Average"""
         try:
-            volume_sma = data['Volume'].rolling(window=period).mean()
-            current_volume = data['Volume'].iloc[-1]
-            return current_volume / volume_sma.iloc[-1] if not volume_sma.empty and volume_sma.iloc[-1] > 0 else 1
+            volume = data['Volume'].to_numpy(dtype=np.float64)
+            volume_sma = volume[-period:].mean() if len(volume) >= period else np.nan
+            current_volume = volume[-1]
+            return current_volume / volume_sma if volume_sma > 0 else 1
         except Exception:
             return 1
     
@@ -167,11 +208,15 @@ class TechnicalIndicators:
         except Exception:
             return 0
     
+    def calculate_vwap_series(self, data: pd.DataFrame) -> pd.Series:
+        """Cumulative Volume Weighted Average Price at every bar"""
+        typical_price = (data['High'] + data['Low'] + data['Close']) / 3
+        return (typical_price * data['Volume']).cumsum() / data['Volume'].cumsum()
+    
     def calculate_vwap(self, data: pd.DataFrame) -> float:
         """Calculate Volume Weighted Average Price"""
         try:
-            typical_price = (data['High'] + data['Low'] + data['Close']) / 3
-            vwap = (typical_price * data['Volume']).cumsum() / data['Volume'].cumsum()
+            vwap = self.calculate_vwap_series(data)
             return vwap.iloc[-1] if not vwap.empty else data['Close'].iloc[-1]
         except Exception:
             return data['Close'].iloc[-1] if not data.empty else 0
@@ -242,4 +287,114 @@ class TechnicalIndicators:
                 'strength': 0,
                 'reasons': [f"Error: {e}"],
                 'signal': 'HOLD'
-            } 
\ No newline at end of file
+            } 
+
+def indicators_for_batch(panel: Dict[str, pd.DataFrame], rsi_period: int = 14,
+                         bb_period: int = 20, atr_period: int = 14) -> pd.DataFrame:
+    """Latest-bar indicators for many symbols at once
+    
+    Right-aligns each symbol's own bars into (bar x symbol) arrays, so every
+    column ends at that symbol's latest bar, and runs each indicator over all
+    columns in one pass instead of once per symbol. Symbols with too few bars
+    get NaN, as the per-symbol calculations return.
+    
+    Args:
+        panel: OHLCV frame per symbol
+    
+    Returns:
+        pd.DataFrame indexed by symbol with price, sma_20, bb_upper, bb_lower,
+        rsi, macd_diff and atr columns
+    """
+    panel = {symbol: data for symbol, data in panel.items() if data is not None and not data.empty}
+    columns = ['price', 'sma_20', 'bb_upper', 'bb_lower', 'rsi', 'macd_diff', 'atr']
+    if not panel:
+        return pd.DataFrame(columns=columns)
+    
+    symbols = list(panel)
+    length = max(len(data) for data in panel.values())
+    
+    def aligned(field: str) -> np.ndarray:
+        out = np.full((length, len(symbols)), np.nan)
+        for j, data in enumerate(panel.values()):
+            values = data[field].to_numpy(dtype=np.float64)
+            out[length - len(values):, j] = values
+        return out
+    
+    close_values, high, low = aligned('Close'), aligned('High'), aligned('Low')
+    close = pd.DataFrame(close_values, columns=symbols)
+    
+    # Bollinger Bands over the trailing window of every column
+    window = close_values[-bb_period:]
+    full = np.isfinite(window).sum(axis=0) == bb_period
+    sma_20 = np.full(len(symbols), np.nan)
+    band = np.full(len(symbols), np.nan)
+    sma_20[full] = window[:, full].mean(axis=0)
+    band[full] = 2 * window[:, full].std(axis=0, ddof=1)
+    
+    # Wilder's RSI
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / rsi_period, adjust=False, min_periods=rsi_period).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / rsi_period, adjust=False, min_periods=rsi_period).mean()
+    rsi = (100 - 100 / (1 + gain / loss)).iloc[-1]
+    
+    # MACD histogram
+    macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+    macd_diff = (macd - macd.ewm(span=9).mean()).iloc[-1]
+    
+    # ATR: mean true range over the trailing window
+    prev_close = np.roll(close_values, 1, axis=0)
+    prev_close[0] = np.nan
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tail = true_range[-atr_period:]
+    full = np.isfinite(tail).sum(axis=0) == atr_period
+    atr = np.full(len(symbols), np.nan)
+    atr[full] = tail[:, full].mean(axis=0)
+    
+    return pd.DataFrame({
+        'price': close_values[-1],
+        'sma_20': sma_20,
+        'bb_upper': sma_20 + band,
+        'bb_lower': sma_20 - band,
+        'rsi': rsi.to_numpy(),
+        'macd_diff': macd_diff.to_numpy(),
+        'atr': atr
+    }, index=close.columns)
+
+def scalping_scores(stats: pd.DataFrame, volume_ratio) -> pd.DataFrame:
+    """0-100 scalping scores for the symbols of an indicators_for_batch result
+    
+    Args:
+        stats: indicators_for_batch output
+        volume_ratio: Current over average volume per symbol, in stats order
+    
+    Returns:
+        pd.DataFrame indexed like stats with volatility, momentum, trend, volume
+        and overall_score columns; a missing indicator scores 0
+    """
+    price = stats['price'].to_numpy(dtype=np.float64)
+    
+    # Volatility: ATR as a percentage of price, full marks at 0.5% per bar
+    atr_pct = stats['atr'].to_numpy(dtype=np.float64) / price * 100
+    volatility = np.clip(atr_pct / 0.5, 0, 1) * 100
+    
+    # Momentum: RSI distance from neutral 50
+    momentum = np.abs(stats['rsi'].to_numpy(dtype=np.float64) - 50) * 2
+    
+    # Trend: price distance from SMA 20 in Bollinger half-widths
+    sma_20 = stats['sma_20'].to_numpy(dtype=np.float64)
+    half_width = stats['bb_upper'].to_numpy(dtype=np.float64) - sma_20
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trend = np.clip(np.abs(price - sma_20) / half_width, 0, 1) * 100
+    
+    # Volume: full marks at twice the average volume
+    volume = np.clip(np.asarray(volume_ratio, dtype=np.float64) / 2, 0, 1) * 100
+    
+    scores = pd.DataFrame({
+        'volatility': volatility,
+        'momentum': momentum,
+        'trend': trend,
+        'volume': volume
+    }, index=stats.index).fillna(0)
+    scores['overall_score'] = (0.3 * scores['volatility'] + 0.3 * scores['momentum']
+                               + 0.2 * scores['trend'] + 0.2 * scores['volume'])
+    return scores
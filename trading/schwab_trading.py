@@ -4,7 +4,7 @@ Schwab Trading API for executing trades
 """
 
 import requests
-import json
+import orjson
 import logging
 from datetime import datetime
 from typing import Dict, Optional, List
@@ -40,7 +40,7 @@ class SchwabTradingAPI:
             response = self.session.get(url)
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Error getting account info: {response.status_code}")
                 return None
@@ -56,7 +56,7 @@ class SchwabTradingAPI:
             response = self.session.get(url)
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Error getting positions: {response.status_code}")
                 return None
@@ -89,7 +89,7 @@ class SchwabTradingAPI:
             response = self.session.post(url, json=order_data)
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Error placing order: {response.status_code}")
                 return None
@@ -129,7 +129,7 @@ class SchwabTradingAPI:
             response = self.session.post(url, json=order_data)
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Error placing options order: {response.status_code}")
                 return None
@@ -161,7 +161,7 @@ class SchwabTradingAPI:
             response = self.session.get(url)
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Error getting order status: {response.status_code}")
                 return None
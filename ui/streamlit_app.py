@@ -6,13 +6,10 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 from datetime import datetime, timedelta
 import time
-import threading
-import asyncio
-import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from functools import lru_cache
 import concurrent.futures
 
@@ -22,12 +19,18 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.data_fetcher import OptimizedDataFetcher as DataFetcher
-from signals.technical_indicators import OptimizedTechnicalIndicators as TechnicalIndicators
+from signals.technical_indicators import TechnicalIndicators, indicators_for_batch, scalping_scores
 from signals.sentiment_analysis import SentimentAnalyzer
 from trading.signal_processor import SignalProcessor
 from trading.risk_manager import RiskManager
-from utils.logger import TradeLogger
-from config.settings import TRADING_CONFIG, TARGET_SYMBOLS, UI_CONFIG, DATA_CONFIG
+from modules import logger as trade_logger
+from config.settings import TRADING_CONFIG, TARGET_SYMBOLS, UI_CONFIG, DATA_CONFIG, load_json_config
+
+# Serialize figures with orjson rather than the stdlib json encoder
+pio.json.config.default_engine = "orjson"
+
+# Longer histories are thinned before plotting to keep chart payloads small
+MAX_CHART_POINTS = 1000
 
 # Configure Streamlit page
 st.set_page_config(
@@ -37,17 +40,24 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource(show_spinner=False)
+def _get_shared_components():
+    """Data fetcher, indicator and sentiment engines, built once per server process
+    
+    The dashboard object is rebuilt on every rerun; these hold connection pools,
+    quote caches and models that should outlive a single run.
+    """
+    return DataFetcher(), TechnicalIndicators(), SentimentAnalyzer()
+
 class OptimizedOptionsScalpingDashboard:
     """Optimized dashboard class with caching and async operations"""
     
     def __init__(self):
         # Initialize components with caching
-        self.data_fetcher = DataFetcher()
-        self.indicators = TechnicalIndicators()
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.data_fetcher, self.indicators, self.sentiment_analyzer = _get_shared_components()
         self.signal_processor = SignalProcessor()
         self.risk_manager = RiskManager()
-        self.logger = TradeLogger()
+        self.logger = trade_logger
         
         # Performance optimization
         self._data_cache = {}
@@ -102,12 +112,16 @@ class OptimizedOptionsScalpingDashboard:
             return None
     
     @st.cache_data(ttl=120)  # Cache for 2 minutes
-    def get_cached_indicators(_self, data: pd.DataFrame) -> Dict[str, pd.Series]:
+    def _cached_indicators(_self, symbol: str, bar_count: int, last_bar: pd.Timestamp, _data: pd.DataFrame) -> Dict:
+        """Indicators for symbol, keyed on its bar count and last bar instead of hashing the frame"""
+        return _self.indicators.calculate_all_indicators(_data)
+    
+    def get_cached_indicators(self, symbol: str, data: pd.DataFrame) -> Dict:
         """Get cached technical indicators"""
         try:
             if data is None or data.empty:
                 return {}
-            return _self.indicators._calculate_indicators_vectorized(data)
+            return self._cached_indicators(symbol, len(data), data.index[-1], data)
         except Exception as e:
             st.error(f"Error calculating indicators: {e}")
             return {}
@@ -321,7 +335,7 @@ class OptimizedOptionsScalpingDashboard:
             with col1:
                 if st.button("🗑️ Clear Cache"):
                     self.data_fetcher.clear_cache()
-                    self.indicators.clear_cache()
+                    self._cached_indicators.clear()
                     st.success("Cache cleared!")
             with col2:
                 if st.button("🔄 Test Live Data"):
@@ -405,124 +419,84 @@ class OptimizedOptionsScalpingDashboard:
         try:
             # Get market data for all symbols
             symbols = TARGET_SYMBOLS[:10]  # Limit to top 10 for performance
-            market_data = self.get_cached_market_data(symbols)
+            market_data = {symbol: data for symbol, data in self.get_cached_market_data(symbols).items() if data}
             
             if not market_data:
                 st.warning("⚠️ No market data available, using mock rankings")
                 return self._generate_mock_rankings(symbols[:5])
             
-            # Get stock data and indicators in parallel
-            stock_data = {}
-            indicators_data = {}
-            current_prices = {}
-            
-            # Use ThreadPoolExecutor for parallel processing with reduced workers
-            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-                # Submit all data fetching tasks
-                future_to_symbol = {}
-                for symbol in list(market_data.keys())[:5]:  # Limit to 5 symbols
-                    future = executor.submit(self._get_symbol_data, symbol)
-                    future_to_symbol[future] = symbol
-                
-                # Collect results
-                for future in concurrent.futures.as_completed(future_to_symbol):
-                    symbol = future_to_symbol[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            stock_data[symbol] = result['stock_data']
-                            indicators_data[symbol] = result['indicators']
-                            current_prices[symbol] = result['current_price']
-                    except Exception as e:
-                        st.warning(f"⚠️ Error processing {symbol}: {e}")
-                        # Continue with other symbols
-            
-            # Calculate rankings
-            if stock_data and indicators_data:
-                return self.indicators.rank_stocks_for_scalping(
-                    stock_data, indicators_data, current_prices
-                )
-            else:
+            # Indicators for every symbol in one pass over their minute bars
+            stats = indicators_for_batch(self._get_minute_panel(market_data))
+            if stats.empty:
                 st.warning("⚠️ No real data available, using mock rankings")
                 return self._generate_mock_rankings(list(market_data.keys())[:5])
             
+            quotes = pd.DataFrame.from_dict(
+                {symbol: market_data[symbol] for symbol in stats.index}, orient='index'
+            ).reindex(columns=['price', 'change_percent', 'volume', 'volume_ratio', 'data_source'])
+            volume_ratio = quotes['volume_ratio'].fillna(1).to_numpy()
+            change_pct = quotes['change_percent'].fillna(0).to_numpy()
+            scores = scalping_scores(stats, volume_ratio)
+            direction, _ = self._calculate_scalping_signals(
+                stats['rsi'].to_numpy(), stats['macd_diff'].to_numpy(), volume_ratio, change_pct
+            )
+            
+            rankings = pd.DataFrame({
+                'symbol': stats.index,
+                'overall_score': scores['overall_score'].round(1).to_numpy(),
+                'signal_direction': direction,
+                'current_price': quotes['price'].fillna(stats['price']).to_numpy(),
+                'volatility': (stats['atr'] / stats['price'] * 100).fillna(0).round(2).to_numpy(),
+                'rsi': stats['rsi'].fillna(50).round(1).to_numpy(),
+                'macd': stats['macd_diff'].fillna(0).round(2).to_numpy(),
+                'volume': quotes['volume'].fillna(0).to_numpy(),
+                'change_percent': change_pct.round(2),
+                'data_source': quotes['data_source'].fillna(self.data_fetcher.get_data_source()).to_numpy()
+            })
+            
+            # Sort by score (highest first)
+            return rankings.sort_values('overall_score', ascending=False, kind='stable').to_dict('records')
+            
         except Exception as e:
             st.error(f"Error calculating rankings: {e}")
             st.info("🔄 Generating mock rankings as fallback...")
             return self._generate_mock_rankings(symbols[:5])
     
+    def _get_minute_panel(self, market_data: Dict[str, Dict]) -> Dict[str, pd.DataFrame]:
+        """Minute bars for every symbol, fetched concurrently so cold-cache round trips overlap"""
+        if not market_data:
+            return {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(DATA_CONFIG["MAX_WORKERS"], len(market_data))) as executor:
+            return dict(zip(market_data, executor.map(
+                lambda symbol: self.get_cached_stock_data(symbol, "1m", "1d"), market_data
+            )))
+    
     def _generate_mock_rankings(self, symbols: List[str]) -> List[Dict]:
         """Generate mock stock rankings when real data is not available"""
-        import random
+        rng = np.random.default_rng()
+        n = len(symbols)
         
-        mock_rankings = []
+        # Generate realistic mock data for every symbol at once, one array per field
+        score = rng.uniform(60, 95, n)  # Good scores to show potential
         
-        for i, symbol in enumerate(symbols):
-            # Generate realistic mock data
-            base_price = random.uniform(50, 500)
-            volatility = random.uniform(0.5, 3.0)
-            score = random.uniform(60, 95)  # Good scores to show potential
-            
-            # Determine signal direction based on score
-            if score >= 80:
-                signal = "BUY"
-            elif score >= 65:
-                signal = "HOLD"
-            else:
-                signal = "SELL"
-            
-            mock_ranking = {
-                'symbol': symbol,
-                'overall_score': round(score, 1),
-                'signal_direction': signal,
-                'current_price': round(base_price, 2),
-                'volatility': round(volatility, 2),
-                'rsi': round(random.uniform(30, 70), 1),
-                'macd': round(random.uniform(-2, 2), 2),
-                'volume': random.randint(1000000, 10000000),
-                'change_percent': round(random.uniform(-5, 8), 2),
-                'data_source': 'mock'
-            }
-            
-            mock_rankings.append(mock_ranking)
+        # Determine signal direction based on score
+        signal = np.select([score >= 80, score >= 65], ["BUY", "HOLD"], "SELL")
         
-        # Sort by score (highest first)
-        mock_rankings.sort(key=lambda x: x['overall_score'], reverse=True)
+        mock_rankings = pd.DataFrame({
+            'symbol': symbols,
+            'overall_score': score.round(1),
+            'signal_direction': signal,
+            'current_price': rng.uniform(50, 500, n).round(2),
+            'volatility': rng.uniform(0.5, 3.0, n).round(2),
+            'rsi': rng.uniform(30, 70, n).round(1),
+            'macd': rng.uniform(-2, 2, n).round(2),
+            'volume': rng.integers(1000000, 10000000, n, endpoint=True),
+            'change_percent': rng.uniform(-5, 8, n).round(2),
+            'data_source': 'mock'
+        })
         
-        return mock_rankings
-    
-    def _get_symbol_data(self, symbol: str) -> Optional[Dict]:
-        """Get stock data and indicators for a symbol"""
-        try:
-            # Get stock data
-            stock_data = self.get_cached_stock_data(symbol)
-            if stock_data is None or stock_data.empty:
-                st.warning(f"⚠️ No stock data available for {symbol}")
-                return None
-            
-            # Get indicators
-            indicators = self.get_cached_indicators(stock_data)
-            if not indicators:
-                st.warning(f"⚠️ No indicators available for {symbol}")
-                return None
-            
-            # Get current price
-            quote = self.data_fetcher.get_real_time_quote(symbol)
-            current_price = quote.get('price', 0) if quote else 0
-            
-            if current_price == 0:
-                st.warning(f"⚠️ No current price available for {symbol}")
-                return None
-            
-            return {
-                'stock_data': stock_data,
-                'indicators': indicators,
-                'current_price': current_price
-            }
-            
-        except Exception as e:
-            st.warning(f"⚠️ Error getting data for {symbol}: {e}")
-            return None
+        # Sort by score (highest first)
+        return mock_rankings.sort_values('overall_score', ascending=False, kind='stable').to_dict('records')
     
     def _display_rankings_table(self, rankings: List[Dict]):
         """Display rankings in an optimized table"""
@@ -591,9 +565,14 @@ class OptimizedOptionsScalpingDashboard:
         # Auto-refresh toggle
         auto_refresh = st.checkbox("🔄 Auto-refresh every 30 seconds", value=True)
         
-        if auto_refresh:
-            time.sleep(0.1)  # Small delay for auto-refresh
-        
+        # Re-run only the signals panel on a timer instead of blocking the script
+        refresh_panel = st.fragment(run_every="30s" if auto_refresh else None)(
+            self._show_scalping_opportunities_panel
+        )
+        refresh_panel()
+    
+    def _show_scalping_opportunities_panel(self):
+        """Render the scalping signal cards and summary"""
         # Get scalping opportunities
         opportunities = self._get_scalping_opportunities()
         
@@ -601,160 +580,140 @@ class OptimizedOptionsScalpingDashboard:
             st.warning("No scalping opportunities found. Market may be quiet or signals are weak.")
             return
         
-        # Display top opportunities in cards
+        # Display top opportunities as a single table rather than a widget grid per row
         st.subheader("🔥 Hot Scalping Signals")
         
-        for i, opp in enumerate(opportunities[:5], 1):
-            with st.container():
-                col1, col2, col3, col4, col5 = st.columns([1, 2, 1, 1, 1])
-                
-                with col1:
-                    if opp['signal'] == 'BUY':
-                        st.markdown("🟢 **BUY**")
-                    else:
-                        st.markdown("🔴 **SELL**")
-                
-                with col2:
-                    st.markdown(f"**{opp['symbol']}** - ${opp['price']:.2f}")
-                    st.caption(f"Signal Strength: {opp['strength']}/10")
-                
-                with col3:
-                    st.metric("Change", f"{opp['change_pct']:+.2f}%")
-                
-                with col4:
-                    st.metric("Volume", f"{opp['volume_ratio']:.1f}x")
-                
-                with col5:
-                    if st.button(f"Trade #{i}", key=f"trade_{opp['symbol']}_{i}"):
-                        self._execute_quick_trade(opp)
-                
-                # Progress bar for signal strength
-                st.progress(opp['strength'] / 10)
-                
-                # Quick stats
-                col_stats1, col_stats2, col_stats3 = st.columns(3)
-                with col_stats1:
-                    st.caption(f"RSI: {opp['rsi']:.1f}")
-                with col_stats2:
-                    st.caption(f"MACD: {opp['macd']:.3f}")
-                with col_stats3:
-                    st.caption(f"ATR: {opp['atr']:.3f}")
-                
-                st.divider()
+        top_opportunities = opportunities[:5]
+        signals_df = pd.DataFrame(top_opportunities)[
+            ['signal', 'symbol', 'price', 'change_pct', 'volume_ratio', 'strength', 'rsi', 'macd', 'atr']
+        ]
+        signals_df['signal'] = signals_df['signal'].map({'BUY': '🟢 BUY', 'SELL': '🔴 SELL'})
+        
+        st.dataframe(
+            signals_df,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'signal': st.column_config.TextColumn("Signal"),
+                'symbol': st.column_config.TextColumn("Symbol"),
+                'price': st.column_config.NumberColumn("Price", format="$%.2f"),
+                'change_pct': st.column_config.NumberColumn("Change", format="%+.2f%%"),
+                'volume_ratio': st.column_config.NumberColumn("Volume", format="%.1fx"),
+                'strength': st.column_config.ProgressColumn("Strength", min_value=0, max_value=10, format="%d/10"),
+                'rsi': st.column_config.NumberColumn("RSI", format="%.1f"),
+                'macd': st.column_config.NumberColumn("MACD", format="%.3f"),
+                'atr': st.column_config.NumberColumn("ATR", format="%.3f"),
+            }
+        )
+        
+        # One trade control for the whole table
+        trade_col1, trade_col2 = st.columns([3, 1])
+        with trade_col1:
+            selected = st.selectbox(
+                "Opportunity",
+                range(len(top_opportunities)),
+                format_func=lambda i: f"#{i + 1} {top_opportunities[i]['symbol']} - {top_opportunities[i]['signal']}",
+                label_visibility="collapsed"
+            )
+        with trade_col2:
+            if st.button("Trade Selected", key="trade_selected_opportunity"):
+                self._execute_quick_trade(top_opportunities[selected])
+        
+        st.divider()
         
         # Quick trade summary
         st.subheader("📊 Quick Trade Summary")
         col_sum1, col_sum2, col_sum3 = st.columns(3)
         
+        # Pull the columns out once and count on the arrays
+        directions = np.array([o['signal'] for o in opportunities])
+        strengths = np.fromiter((o['strength'] for o in opportunities), dtype=np.float64, count=len(opportunities))
+        
         with col_sum1:
-            buy_signals = len([o for o in opportunities if o['signal'] == 'BUY'])
-            st.metric("Buy Signals", buy_signals)
+            st.metric("Buy Signals", int(np.count_nonzero(directions == 'BUY')))
         
         with col_sum2:
-            sell_signals = len([o for o in opportunities if o['signal'] == 'SELL'])
-            st.metric("Sell Signals", sell_signals)
+            st.metric("Sell Signals", int(np.count_nonzero(directions == 'SELL')))
         
         with col_sum3:
-            avg_strength = sum(o['strength'] for o in opportunities) / len(opportunities)
-            st.metric("Avg Strength", f"{avg_strength:.1f}/10")
+            st.metric("Avg Strength", f"{strengths.mean():.1f}/10")
     
     def _get_scalping_opportunities(self) -> List[Dict]:
         """Get real-time scalping opportunities"""
         try:
             # Get current market data for target symbols
             symbols = TARGET_SYMBOLS[:10]  # Focus on top 10 for speed
-            market_data = self.get_cached_market_data(symbols)
-            
-            opportunities = []
-            
-            for symbol, data in market_data.items():
-                if not data:
-                    continue
-                
-                # Get technical indicators
-                stock_data = self.get_cached_stock_data(symbol, "1m", "1d")
-                if stock_data is None or stock_data.empty:
-                    continue
-                
-                indicators = self.get_cached_indicators(stock_data)
-                
-                # Calculate scalping signal
-                signal = self._calculate_scalping_signal(indicators, data)
-                
-                if signal['strength'] >= 6:  # Only show strong signals
-                    opportunities.append({
-                        'symbol': symbol,
-                        'price': data.get('price', 0),
-                        'change_pct': data.get('change_percent', 0),
-                        'volume_ratio': data.get('volume_ratio', 1),
-                        'signal': signal['direction'],
-                        'strength': signal['strength'],
-                        'rsi': indicators.get('rsi', pd.Series()).iloc[-1] if 'rsi' in indicators else 50,
-                        'macd': indicators.get('macd', {}).get('macd_diff', pd.Series()).iloc[-1] if 'macd' in indicators else 0,
-                        'atr': indicators.get('atr', pd.Series()).iloc[-1] if 'atr' in indicators else 0
-                    })
-            
-            # Sort by signal strength
-            opportunities.sort(key=lambda x: x['strength'], reverse=True)
-            return opportunities
+            market_data = {symbol: data for symbol, data in self.get_cached_market_data(symbols).items() if data}
+            
+            # Minute bars for every symbol, then indicators for all of them in one pass
+            stats = indicators_for_batch(self._get_minute_panel(market_data))
+            if stats.empty:
+                return []
+            
+            quotes = pd.DataFrame.from_dict(
+                {symbol: market_data[symbol] for symbol in stats.index}, orient='index'
+            ).reindex(columns=['price', 'change_percent', 'volume_ratio'])
+            frame = pd.DataFrame({
+                'symbol': stats.index,
+                'price': quotes['price'].fillna(0).to_numpy(),
+                'change_pct': quotes['change_percent'].fillna(0).to_numpy(),
+                'volume_ratio': quotes['volume_ratio'].fillna(1).to_numpy(),
+                'rsi': stats['rsi'].to_numpy(),
+                'macd': stats['macd_diff'].to_numpy(),
+                'atr': stats['atr'].fillna(0).to_numpy()
+            })
+            
+            # Calculate scalping signals for every symbol at once
+            frame['signal'], frame['strength'] = self._calculate_scalping_signals(
+                frame['rsi'].to_numpy(), frame['macd'].to_numpy(),
+                frame['volume_ratio'].to_numpy(), frame['change_pct'].to_numpy()
+            )
+            frame = frame.fillna({'rsi': 50, 'macd': 0})
+            
+            # Only show strong signals, strongest first; ties go to heavier volume, then the bigger move
+            frame = frame[frame['strength'] >= 6]
+            order = np.lexsort((
+                -frame['change_pct'].abs().to_numpy(),
+                -frame['volume_ratio'].to_numpy(),
+                -frame['strength'].to_numpy()
+            ))
+            return frame.iloc[order].to_dict('records')
             
         except Exception as e:
             st.error(f"Error getting scalping opportunities: {e}")
             return []
     
-    def _calculate_scalping_signal(self, indicators: Dict, market_data: Dict) -> Dict:
-        """Calculate scalping signal strength and direction"""
-        try:
-            strength = 0
-            direction = 'HOLD'
-            
-            # RSI signals
-            rsi = indicators.get('rsi', pd.Series())
-            if not rsi.empty:
-                current_rsi = rsi.iloc[-1]
-                if current_rsi < 30:
-                    strength += 2
-                    direction = 'BUY'
-                elif current_rsi > 70:
-                    strength += 2
-                    direction = 'SELL'
-                elif 40 <= current_rsi <= 60:
-                    strength += 1
-            
-            # MACD signals
-            macd_data = indicators.get('macd', {})
-            if isinstance(macd_data, dict) and 'macd_diff' in macd_data:
-                macd_diff = macd_data['macd_diff']
-                if not macd_diff.empty:
-                    current_macd = macd_diff.iloc[-1]
-                    if current_macd > 0:
-                        strength += 2
-                        if direction == 'HOLD':
-                            direction = 'BUY'
-                    else:
-                        strength += 1
-                        if direction == 'HOLD':
-                            direction = 'SELL'
-            
-            # Volume signals
-            volume_ratio = market_data.get('volume_ratio', 1)
-            if volume_ratio > 1.5:
-                strength += 2
-            elif volume_ratio > 1.2:
-                strength += 1
-            
-            # Price momentum
-            change_pct = market_data.get('change_percent', 0)
-            if abs(change_pct) > 2:
-                strength += 1
-            
-            return {
-                'direction': direction,
-                'strength': min(strength, 10)
-            }
-            
-        except Exception as e:
-            return {'direction': 'HOLD', 'strength': 0}
+    @staticmethod
+    def _calculate_scalping_signals(rsi: np.ndarray, macd_diff: np.ndarray, volume_ratio: np.ndarray,
+                                    change_pct: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Scalping signal direction and strength (0-10) per symbol
+        
+        Scores all symbols with boolean masks rather than a branch cascade per
+        symbol; a NaN RSI or MACD contributes nothing, as a missing indicator did.
+        """
+        # RSI signals; comparisons against NaN are False
+        rsi_buy = rsi < 30
+        rsi_sell = rsi > 70
+        rsi_neutral = (rsi >= 40) & (rsi <= 60)
+        
+        # MACD signals
+        macd_up = macd_diff > 0
+        macd_down = macd_diff <= 0
+        
+        strength = (
+            2 * (rsi_buy | rsi_sell) + rsi_neutral
+            + 2 * macd_up + macd_down
+            + 2 * (volume_ratio > 1.5) + ((volume_ratio > 1.2) & (volume_ratio <= 1.5))
+            + (np.abs(change_pct) > 2)
+        )
+        
+        # RSI extremes set the direction; otherwise MACD does
+        direction = np.select(
+            [rsi_buy, rsi_sell, macd_up, macd_down],
+            ['BUY', 'SELL', 'BUY', 'SELL'],
+            default='HOLD'
+        )
+        return direction, np.minimum(strength, 10)
     
     def _execute_quick_trade(self, opportunity: Dict):
         """Execute a quick scalping trade"""
@@ -822,17 +781,15 @@ class OptimizedOptionsScalpingDashboard:
             
             # Check config file for saved tokens
             try:
-                with open('config.json', 'r') as f:
-                    config = json.load(f)
-                    schwab_auth = config.get('schwab_auth', {})
-                    # Check if we have access_token or auth_code
-                    if schwab_auth.get('access_token') or schwab_auth.get('auth_code'):
-                        return {
-                            'authenticated': True,
-                            'method': schwab_auth.get('method', 'OAuth2'),
-                            'last_auth': schwab_auth.get('timestamp', 'Unknown'),
-                            'expires': schwab_auth.get('expires', '1 hour')
-                        }
+                schwab_auth = load_json_config('config.json').get('schwab_auth', {})
+                # Check if we have access_token or auth_code
+                if schwab_auth.get('access_token') or schwab_auth.get('auth_code'):
+                    return {
+                        'authenticated': True,
+                        'method': schwab_auth.get('method', 'OAuth2'),
+                        'last_auth': schwab_auth.get('timestamp', 'Unknown'),
+                        'expires': schwab_auth.get('expires', '1 hour')
+                    }
             except:
                 pass
             
@@ -1175,7 +1132,7 @@ class OptimizedOptionsScalpingDashboard:
             # Get data and indicators
             stock_data = self.get_cached_stock_data(symbol)
             if stock_data is not None and not stock_data.empty:
-                indicators = self.get_cached_indicators(stock_data)
+                indicators = self.get_cached_indicators(symbol, stock_data)
                 
                 if indicators:
                     self._display_signal_analysis(symbol, stock_data, indicators)
@@ -1184,11 +1141,11 @@ class OptimizedOptionsScalpingDashboard:
             else:
                 st.error("❌ No stock data available")
     
-    def _display_signal_analysis(self, symbol: str, data: pd.DataFrame, indicators: Dict[str, pd.Series]):
+    def _display_signal_analysis(self, symbol: str, data: pd.DataFrame, indicators: Dict):
         """Display signal analysis for a symbol"""
-        # Calculate scores
-        current_price = data['Close'].iloc[-1]
-        scores = self.indicators.calculate_stock_scalping_score(data, indicators, current_price)
+        # Calculate scores; volume_sma holds the current-over-average volume ratio
+        stats = indicators_for_batch({symbol: data})
+        scores = scalping_scores(stats, [indicators.get('volume_sma', 1)]).iloc[0]
         
         # Display scores
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -1204,60 +1161,75 @@ class OptimizedOptionsScalpingDashboard:
             st.metric("Volume", f"{scores['volume']:.1f}")
         
         # Display charts
-        self._display_indicator_charts(data, indicators)
+        self._display_indicator_charts(data)
     
-    def _display_indicator_charts(self, data: pd.DataFrame, indicators: Dict[str, pd.Series]):
+    def _display_indicator_charts(self, data: pd.DataFrame):
         """Display indicator charts"""
+        # Cached indicators hold only the latest values; chart lines need a value per bar
+        close = data['Close']
+        vwap = self.indicators.calculate_vwap_series(data) if 'Volume' in data else None
+        ema_20 = close.ewm(span=20).mean()
+        rsi = self.indicators.calculate_rsi_series(close)
+        
+        # Thin long histories to at most MAX_CHART_POINTS points; series share the data index
+        step = -(-len(data) // MAX_CHART_POINTS)
+        if step > 1:
+            data = data.iloc[::step]
+        
+        def thin(series: pd.Series) -> pd.Series:
+            return series.iloc[::step] if step > 1 else series
+        
+        # Plain arrays serialize directly; Series are converted via tolist() by plotly
+        x = data.index.to_numpy()
+        
         # Price chart with indicators
         fig = go.Figure()
         
         # Add price data
         fig.add_trace(go.Candlestick(
-            x=data.index,
-            open=data['Open'],
-            high=data['High'],
-            low=data['Low'],
-            close=data['Close'],
+            x=x,
+            open=data['Open'].to_numpy(),
+            high=data['High'].to_numpy(),
+            low=data['Low'].to_numpy(),
+            close=data['Close'].to_numpy(),
             name='Price'
         ))
         
-        # Add VWAP if available
-        if 'vwap' in indicators and not indicators['vwap'].empty:
-            fig.add_trace(go.Scatter(
-                x=data.index,
-                y=indicators['vwap'],
+        # Add VWAP if the bars carry volume
+        if vwap is not None:
+            fig.add_trace(go.Scattergl(
+                x=x,
+                y=thin(vwap).to_numpy(),
                 mode='lines',
                 name='VWAP',
                 line=dict(color='purple')
             ))
         
-        # Add EMA if available
-        if 'ema_trend' in indicators and isinstance(indicators['ema_trend'], dict):
-            ema_data = indicators['ema_trend']
-            if 'ema_20' in ema_data and not ema_data['ema_20'].empty:
-                fig.add_trace(go.Scatter(
-                    x=data.index,
-                    y=ema_data['ema_20'],
-                    mode='lines',
-                    name='EMA 20',
-                    line=dict(color='orange')
-                ))
+        # Add EMA
+        fig.add_trace(go.Scattergl(
+            x=x,
+            y=thin(ema_20).to_numpy(),
+            mode='lines',
+            name='EMA 20',
+            line=dict(color='orange')
+        ))
         
         fig.update_layout(
             title="Price Chart with Indicators",
             xaxis_title="Time",
             yaxis_title="Price",
-            height=400
+            height=400,
+            uirevision='price'  # keep pan/zoom across reruns
         )
         
         st.plotly_chart(fig, use_container_width=True)
         
         # RSI chart
-        if 'rsi' in indicators and not indicators['rsi'].empty:
+        if rsi.notna().any():
             fig_rsi = go.Figure()
-            fig_rsi.add_trace(go.Scatter(
-                x=data.index,
-                y=indicators['rsi'],
+            fig_rsi.add_trace(go.Scattergl(
+                x=x,
+                y=thin(rsi).to_numpy(),
                 mode='lines',
                 name='RSI',
                 line=dict(color='blue')
@@ -1271,7 +1243,8 @@ class OptimizedOptionsScalpingDashboard:
                 title="RSI Indicator",
                 xaxis_title="Time",
                 yaxis_title="RSI",
-                height=300
+                height=300,
+                uirevision='rsi'
             )
             
             st.plotly_chart(fig_rsi, use_container_width=True)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Atomic File Writes
+Replace credential/config files in one step so a crash never leaves them truncated
+"""
+
+import os
+from typing import Optional
+
+
+def write_atomic(path: str, data: bytes, mode: Optional[int] = None):
+    """Write data to path via a temporary file and an atomic rename
+
+    Args:
+        path: File to replace
+        data: Complete new contents
+        mode: Permission bits applied before the file becomes visible (e.g. 0o600)
+    """
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    if mode is not None:
+        os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Session for yfinance
+Cached (requests_cache) or pooled (requests) session reused by every yf.Ticker
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+YF_CACHE_FILE = "yf_cache.sqlite"
+YF_CACHE_TTL = 60  # seconds
+# Live quotes (v7 quote and the quoteSummary behind Ticker.info) bypass the cache;
+# only chart history and other metadata are served from it
+YF_UNCACHED_URLS = ("*/finance/quote*",)
+
+
+def _build_yf_session():
+    """Build the session handed to yf.Ticker, or None to let yfinance manage its own"""
+    try:
+        import curl_cffi  # noqa: F401
+        # yfinance>=0.2.54 only accepts curl_cffi sessions and pools one internally
+        return None
+    except ImportError:
+        pass
+
+    try:
+        import requests_cache
+        do_not_cache = getattr(requests_cache, "DO_NOT_CACHE", 0)
+        return requests_cache.CachedSession(
+            YF_CACHE_FILE, expire_after=YF_CACHE_TTL, backend='sqlite',
+            urls_expire_after={pattern: do_not_cache for pattern in YF_UNCACHED_URLS}
+        )
+    except ImportError:
+        logger.info("requests_cache not installed, yfinance will use a pooled session without caching")
+
+    try:
+        import requests
+        return requests.Session()
+    except ImportError:
+        return None
+
+
+YF_SESSION = _build_yf_session()
@@ -44,6 +44,7 @@ class OptimizedPerformanceMonitor:
         self.start_time = time.time()
         self.monitoring = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()
         self.lock = threading.Lock()
         
         # Performance thresholds
@@ -74,6 +75,7 @@ class OptimizedPerformanceMonitor:
             return
         
         self.monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_loop, args=(interval,), daemon=True)
         self.monitor_thread.start()
         logger.info("🚀 Performance monitoring started")
@@ -81,6 +83,7 @@ class OptimizedPerformanceMonitor:
     def stop_monitoring(self):
         """Stop performance monitoring"""
         self.monitoring = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5.0)
         logger.info("⏹️ Performance monitoring stopped")
@@ -93,10 +96,11 @@ class OptimizedPerformanceMonitor:
                 self._store_metrics(metrics)
                 self._check_thresholds(metrics)
                 self._optimize_performance(metrics)
-                time.sleep(interval)
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(interval)
+            # Sleeps for the interval but wakes as soon as stop_monitoring() fires
+            if self._stop_event.wait(interval):
+                break
     
     def _collect_metrics(self) -> PerformanceMetrics:
         """Collect current performance metrics"""
@@ -7,10 +7,14 @@ Handles API keys and sensitive data securely
 import os
 import json
 import logging
+import orjson
 from typing import Dict, Optional
 from cryptography.fernet import Fernet
 import base64
 
+from config.settings import load_json_config
+from utils.atomic_file import write_atomic
+
 logger = logging.getLogger(__name__)
 
 class SecureConfig:
@@ -74,10 +78,7 @@ class SecureConfig:
         # Fallback to config file
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                
-                api_keys = config.get('api_keys', {})
+                api_keys = load_json_config(self.config_file).get('api_keys', {})
                 encrypted_value = api_keys.get(key_name, '')
                 
                 if encrypted_value:
@@ -109,20 +110,23 @@ class SecureConfig:
         encrypted_value = self._encrypt_value(value)
         
         # Update config
-        if 'api_keys' not in config:
-            config['api_keys'] = {}
-        
-        config['api_keys'][key_name] = encrypted_value
+        config.setdefault('api_keys', {})[key_name] = encrypted_value
         
         # Save config
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=4)
-        
-        # Set restrictive permissions
-        os.chmod(self.config_file, 0o600)
+        self._write_config(config)
         
         logger.info(f"Saved encrypted {key_name} to config file")
     
+    def _write_config(self, config: Dict):
+        """Atomically replace the config file with restrictive permissions
+        
+        The JSON is written to a temporary file beside the config and renamed
+        over it, so an interrupted write never leaves a truncated config.json.
+        """
+        # Restrictive permissions are set before the file becomes visible
+        write_atomic(self.config_file, orjson.dumps(config, option=orjson.OPT_INDENT_2), mode=0o600)
+        load_json_config.cache_clear()
+    
     def get_all_api_keys(self) -> Dict[str, str]:
         """Get all API keys"""
         keys = {}